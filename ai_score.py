@@ -1,30 +1,192 @@
 # ai_score.py
 
 import json
+import os
+from bisect import bisect_right, insort
+from functools import partial
 from pathlib import Path
+from heapq import nlargest
+from itertools import groupby
+from constants import AI_SCORE_FILE, AI_SCORE_LOG_FILE, AI_SCORE_COMPACT_EVERY, SCORE_BACKEND, SCORE_DATABASE_FILE
+from score_writer import SCORE_WRITER
+
+
+def read_json_lines(path):
+    """Yield the records of a JSON lines file, skipping a last line cut short by a crash"""
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping unreadable line in {path}")
+
+
+def ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def write_json_lines(path, header, records):
+    """Replace a JSON lines file in one step, writing a temporary file and renaming it over the old one"""
+    temp_path = Path(str(path) + '.tmp')
+    with open(temp_path, 'w') as f:
+        f.write(json.dumps(header) + '\n')
+        for record in records:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class LeaderboardIndex:
+    """Score differences grouped by AI delay, each group kept sorted so lookups are a binary search"""
+    def __init__(self):
+        self.by_delay = {}  # delay -> ascending list of score differences
+
+    def build(self, groups):
+        """Replace the index with already sorted groups"""
+        self.by_delay = groups
+
+    def add(self, delay, score_difference):
+        insort(self.by_delay.setdefault(delay, []), score_difference)
+
+    def count_better(self, delay, score_difference):
+        """How many recorded games at this delay beat the given score difference"""
+        scores = self.by_delay.get(delay)
+        if not scores:
+            return 0
+        return len(scores) - bisect_right(scores, score_difference)
+
+    def count(self, delay):
+        return len(self.by_delay.get(delay, ()))
+
+    def count_at_or_below(self, delay, score_difference):
+        return bisect_right(self.by_delay.get(delay, ()), score_difference)
+
+    def histogram(self, delay, bucket_size):
+        scores = self.by_delay.get(delay, ())
+        return [(bucket, sum(1 for _ in group))
+                for bucket, group in groupby(scores, key=lambda s: s - s % bucket_size)]
+
 
 class AIScore:
-    def __init__(self):
-        self.file_path = Path(__file__).parent / 'ai_scores.json'
+    """AI game results, kept as a snapshot plus an append-only log of the games since it was written.
+
+    Both files are JSON lines whose first line is a header with a generation number.
+    Compaction writes a new snapshot with the next generation and then starts a fresh log,
+    so a log left behind by a crash in between has an old generation and is skipped.
+
+    With the 'sqlite' backend the results live in the score database instead, and the
+    files are only read once to fill an empty database. Database writes are synchronous,
+    the placement shown straight after a game has to count that game.
+    """
+    def __init__(self, snapshot_path=None, log_path=None, backend=SCORE_BACKEND, store=None):
+        base = Path(__file__).parent
+        self.file_path = Path(snapshot_path) if snapshot_path else base / AI_SCORE_FILE
+        self.log_path = Path(log_path) if log_path else base / AI_SCORE_LOG_FILE
+        self.legacy_path = base / 'ai_scores.json'  # Single document the scores used to be kept in
+        self.generation = 0
+        self.logged_records = 0  # Games in the log, folded into the snapshot by compact
+        self.index = LeaderboardIndex()
+
+        self.store = store
+        if self.store is None and backend == 'sqlite':
+            from score_store import SQLiteScoreStore
+            self.store = SQLiteScoreStore(base / SCORE_DATABASE_FILE)
+        if self.store is not None:
+            if self.store.ai_count() == 0:
+                self.store.add_ai_scores(self.load_scores()["scores"])
+            self.scores = {"scores": []}  # Nothing kept in memory, queries go to the database
+            return
+
         self.scores = self.load_scores()
+        if not self.log_usable:
+            self.compact()
+        self.build_index()
 
     def load_scores(self):
-        if not self.file_path.exists():
-            return {"scores": []}
-        
-        with open(self.file_path, 'r') as f:
-            return json.load(f)
+        """Read the snapshot then replay the log, one line at a time"""
+        scores = []
+        if self.file_path.exists():
+            records = read_json_lines(self.file_path)
+            self.generation = next(records, {}).get("generation", 0)
+            scores.extend(records)
+        elif self.legacy_path.exists():
+            with open(self.legacy_path, 'r') as f:
+                scores.extend(json.load(f).get("scores", []))
+
+        self.logged_records = 0
+        self.log_usable = True
+        if self.log_path.exists():
+            records = read_json_lines(self.log_path)
+            if next(records, {}).get("generation") == self.generation:
+                for record in records:
+                    scores.append(record)
+                    self.logged_records += 1
+            else:
+                self.log_usable = False  # Left over from a compaction that didn't finish, already in the snapshot
+            if not ends_with_newline(self.log_path):
+                self.log_usable = False  # New lines would be glued onto the cut off one
+        return {"scores": scores}
 
     def save_scores(self):
-        with open(self.file_path, 'w') as f:
-            json.dump(self.scores, f, indent=4)
+        """Wait for pending appends, every game is already logged and compaction runs on its own schedule"""
+        SCORE_WRITER.flush()
+
+    def compact(self):
+        """Roll the log into a new snapshot and start an empty log, on the score writer thread"""
+        self.generation += 1
+        self.logged_records = 0
+        records = list(self.scores["scores"])
+        SCORE_WRITER.submit(partial(self.write_snapshot, records, self.generation))
+
+    def write_snapshot(self, records, generation):
+        try:
+            write_json_lines(self.file_path, {"generation": generation}, records)
+            write_json_lines(self.log_path, {"generation": generation}, [])
+        except Exception as e:
+            print(f"Error compacting AI scores: {e}")
+
+    def append_to_log(self, record, generation):
+        """Add one game to the log and make sure it's on disk before returning"""
+        try:
+            if not self.log_path.exists():
+                write_json_lines(self.log_path, {"generation": generation}, [])
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            print(f"Error saving AI score: {e}")
 
     def add_score(self, score_data):
+        if self.store is not None:
+            self.store.add_ai_score(score_data)
+            return
         if "scores" not in self.scores:
             self.scores["scores"] = []
             
         self.scores["scores"].append(score_data)
-        self.save_scores()
+        self.index.add(score_data["delay"], score_data["score_difference"])
+        # Appends are never coalesced, every game gets its own line
+        self.logged_records += 1
+        SCORE_WRITER.submit(partial(self.append_to_log, score_data, self.generation))
+        if self.logged_records >= AI_SCORE_COMPACT_EVERY:
+            self.compact()
+
+    def build_index(self):
+        """Group and sort the loaded scores once, add_score keeps the index up to date after that"""
+        delay_groups = {}
+        for score in self.scores.get("scores", []):
+            delay_groups.setdefault(score["delay"], []).append(score["score_difference"])
+        # quicksort gives descending order, the index searches ascending lists
+        self.index.build({delay: self.quicksort(group)[::-1] for delay, group in delay_groups.items()})
 
     def quicksort(self, arr):
 
@@ -52,27 +214,34 @@ class AIScore:
         return self.quicksort(left) + middle + self.quicksort(right)
 
     def get_placement(self, score_difference, delay):
-        # Group scores by delay
-        delay_groups = {}
-        for score in self.scores["scores"]:
-            if score["delay"] not in delay_groups:
-                delay_groups[score["delay"]] = []
-            delay_groups[score["delay"]].append(score["score_difference"])
-
-        # Sort the scores for the specified delay
-        if delay not in delay_groups:
-            return 1  # No scores for this delay, so placement is 1
-
-        delay_scores = delay_groups[delay]
-        delay_scores = self.quicksort(delay_scores)
-
-        # Find placement
-        placement = 1
-        for s in delay_scores:
-            if s > score_difference:
-                placement += 1
-
-        return placement
+        if self.store is not None:
+            return self.store.ai_rank(delay, score_difference)
+        # One place behind every game at this delay with a better score difference
+        return self.index.count_better(delay, score_difference) + 1
 
     def get_total_games(self, delay):
-        return sum(1 for s in self.scores["scores"] if s["delay"] == delay)
+        if self.store is not None:
+            return self.store.ai_count(delay)
+        return self.index.count(delay)
+
+    def get_percentile(self, score_difference, delay):
+        """Percentage of games at this delay the score difference matches or beats"""
+        if self.store is not None:
+            return self.store.ai_percentile(delay, score_difference)
+        total = self.index.count(delay)
+        if not total:
+            return 100.0
+        return self.index.count_at_or_below(delay, score_difference) / total * 100
+
+    def get_histogram(self, delay, bucket_size=1000):
+        """(bucket start, games) for each bucket of score differences at this delay"""
+        if self.store is not None:
+            return self.store.ai_histogram(delay, bucket_size)
+        return self.index.histogram(delay, bucket_size)
+
+    def get_top(self, delay, count=10):
+        """The best games at this delay, best first"""
+        if self.store is not None:
+            return self.store.ai_top(delay, count)
+        games = (s for s in self.scores["scores"] if s["delay"] == delay)
+        return nlargest(count, games, key=lambda s: s["score_difference"])
@@ -0,0 +1,94 @@
+# ai_worker.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class PlanJob:
+    """One background search, deepened one ply at a time so a usable move is always available early"""
+    def __init__(self, snapshot, max_depth):
+        self.snapshot = snapshot
+        self.max_depth = max_depth
+        self.submit_time = time.perf_counter()
+        self.lock = threading.Lock()
+        self.best_move = None       # Move from the deepest search finished so far
+        self.depth_completed = 0
+        self.done = False
+        self.cancelled = False
+        self.error = None
+
+    def publish(self, best_move, depth):
+        with self.lock:
+            self.best_move = best_move
+            self.depth_completed = depth
+
+    def latest(self):
+        with self.lock:
+            return self.best_move, self.depth_completed
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.submit_time) * 1000
+
+
+class AsyncPlanner:
+    """Runs TetrisAI searches on a worker thread so the game loop never waits for them"""
+    def __init__(self, ai, deadline_ms):
+        self.ai = ai
+        self.deadline_ms = deadline_ms  # After this the deepest finished result is used
+        # One worker, the AI's caches are only ever touched by one search at a time
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ai-planner')
+        self.job = None
+        self.completed_searches = 0
+        self.deadline_fallbacks = 0  # Times a shallower result was used because the deadline passed
+
+    def submit(self, snapshot):
+        """Start searching a snapshot, abandoning any search still running"""
+        self.cancel()
+        self.job = PlanJob(snapshot, self.ai.planner.depth)
+        self.executor.submit(self._run, self.job)
+        return self.job
+
+    def _run(self, job):
+        try:
+            for depth in range(1, job.max_depth + 1):
+                if job.cancelled:
+                    break
+                best_move = self.ai.plan_from_snapshot(job.snapshot, depth)
+                if best_move is None:
+                    break
+                job.publish(best_move, depth)
+        except Exception as e:
+            print(f"Error in background AI search: {e}")
+            job.error = e
+        finally:
+            job.done = True
+
+    def poll(self):
+        """Return (finished, best_move) for the current job without blocking"""
+        job = self.job
+        if job is None:
+            return False, None
+
+        best_move, depth = job.latest()
+        if job.done:
+            self.completed_searches += 1
+            self.job = None
+            return True, best_move
+
+        if best_move is not None and job.elapsed_ms() >= self.deadline_ms:
+            # Out of time: settle for the last completed depth and stop the deeper search
+            self.deadline_fallbacks += 1
+            job.cancelled = True
+            self.job = None
+            return True, best_move
+        return False, None
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancelled = True
+            self.job = None
+
+    def shutdown(self):
+        """Stop after the search depth in progress, so exiting doesn't wait for a whole deep search"""
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,48 @@
+# batch_evaluator.py
+
+import numpy as np
+
+class BatchEvaluator:
+    """Scores a whole stack of candidate boards with vectorized NumPy operations"""
+    def __init__(self, weights):
+        self.weights = weights  # Shared with TetrisAI so weight changes apply to both
+
+    def stack_boards(self, boards, width):
+        """Turn a list of bitboard row lists into a (N, height, width) boolean array"""
+        rows = np.array(boards, dtype=np.int64)
+        return ((rows[:, :, None] >> np.arange(width)) & 1).astype(bool)
+
+    def calculate_heuristics(self, boards):
+        """Calculate every heuristic for each board in a (N, height, width) array"""
+        height = boards.shape[1]
+        width = boards.shape[2]
+
+        # Column heights from the first filled row of every column
+        has_block = boards.any(axis=1)
+        first_block = boards.argmax(axis=1)
+        heights = np.where(has_block, height - first_block, 0)
+
+        # Every empty cell under a column's top block is a hole, the n-th one deep costs n
+        holes = heights - boards.sum(axis=1)
+        covered_holes = (holes * (holes + 1) // 2).sum(axis=1)
+
+        # cumsum adds left to right like the builtin sum(), so the floats match evaluate_position
+        aggregate_height = np.cumsum(heights * 1.2, axis=1)[:, -1]
+        avg_height = heights.sum(axis=1) / width
+        squared_error = (heights - avg_height[:, None]) ** 2
+        surface_variance = np.cumsum(squared_error, axis=1)[:, -1] / width
+
+        return {
+            'aggregate_height': aggregate_height,
+            'maximum_height': heights.max(axis=1),
+            'surface_variance': surface_variance,
+            'covered_holes': covered_holes,
+        }
+
+    def evaluate(self, boards):
+        """Return the weighted score of every board as a float array"""
+        heuristics = self.calculate_heuristics(boards)
+        scores = np.zeros(boards.shape[0])
+        for key, value in heuristics.items():
+            scores = scores + self.weights[key] * value
+        return scores
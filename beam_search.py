@@ -0,0 +1,127 @@
+# beam_search.py
+
+import time
+from placement_tables import PLACEMENT_TABLES, legal_x_range
+from transposition import ZOBRIST
+
+class SearchNode:
+    """One board reached during the search, with the pieces still to come"""
+    def __init__(self, board, current, hold, can_hold, next_index, root_move=None):
+        self.board = board
+        self.current = current        # Shape to place next, None when the preview has run out
+        self.hold = hold              # Shape in the hold slot or None
+        self.can_hold = can_hold
+        self.next_index = next_index  # Position of the next unused piece in the preview
+        self.root_move = root_move    # First move that leads to this board
+        self.board_hash = ZOBRIST.hash_rows(board.rows)
+        self.score = None
+
+    def state_key(self):
+        """Nodes with the same key lead to exactly the same futures"""
+        return (self.board_hash, self.current, self.hold, self.next_index)
+
+
+class BeamSearchPlanner:
+    """Plans several pieces ahead using the preview queue, keeping only the best boards per depth"""
+    def __init__(self, ai, depth=2, beam_width=8):
+        self.ai = ai
+        self.depth = depth
+        self.beam_width = beam_width
+        self.nodes_per_depth = [0] * depth        # Boards generated at each depth by the last search
+        self.total_nodes_per_depth = [0] * depth  # Same, summed over every search
+        self.searches = 0
+        self.last_search_time = 0
+
+    def plan(self, board, current, preview, hold=None, can_hold=True, max_depth=None):
+        """Return the best first move as a move dict, or None if the piece can't be placed"""
+        start_time = time.perf_counter()
+        max_depth = min(max_depth or self.depth, self.depth)
+        self.nodes_per_depth = [0] * self.depth
+
+        root = SearchNode(board, current, hold, can_hold, 0)
+        beam = [root]
+        best = None
+
+        for depth in range(max_depth):
+            children = []
+            for node in beam:
+                if node.current is not None:
+                    children.extend(self.expand(node, preview))
+            if not children:
+                break
+
+            self.nodes_per_depth[depth] = len(children)
+            self.total_nodes_per_depth[depth] += len(children)
+
+            # Score every board at this depth in one vectorized pass
+            scores = self.ai.evaluate_boards([child.board.rows for child in children], board.width,
+                                             [child.board_hash for child in children])
+            for child, score in zip(children, scores):
+                child.score = score
+
+            # Prune with the heuristic, keeping only the most promising boards and
+            # dropping positions already reached through a different move order
+            children.sort(key=lambda child: child.score, reverse=True)
+            beam = []
+            seen = set()
+            for child in children:
+                if child.state_key() not in seen:
+                    seen.add(child.state_key())
+                    beam.append(child)
+                    if len(beam) == self.beam_width:
+                        break
+            best = beam[0]
+
+        self.searches += 1
+        self.last_search_time = time.perf_counter() - start_time
+
+        if best is None:
+            return None
+        move = dict(best.root_move)
+        move['score'] = best.score
+        return move
+
+    def expand(self, node, preview):
+        """Generate every board reachable by placing the node's next piece, with or without hold"""
+        # (shape to place, hold slot afterwards, next preview index afterwards, uses hold)
+        options = [(node.current, node.hold, node.next_index, False)]
+        if node.can_hold:
+            if node.hold is None:
+                # Holding into an empty slot brings in the next preview piece
+                if node.next_index < len(preview):
+                    options.append((preview[node.next_index], node.current, node.next_index + 1, True))
+            elif node.hold != node.current:
+                options.append((node.hold, node.current, node.next_index, True))
+
+        board = node.board
+        heights, _ = board.column_profile()
+        tops = [board.height - h for h in heights]
+        children = []
+
+        for piece_shape, hold, next_index, requires_hold in options:
+            next_piece = preview[next_index] if next_index < len(preview) else None
+            rotations = PLACEMENT_TABLES[piece_shape]
+            for rotation in self.ai.get_reachable_rotations(piece_shape, board):
+                table = rotations[rotation]
+                for x in legal_x_range(table, board.width):
+                    landing_y = self.ai.find_landing_row(table, x, board, tops)
+                    if landing_y is None:
+                        continue
+
+                    resulting_board = board.copy()
+                    resulting_board.lock(table, x, landing_y)
+                    resulting_board.clear_lines()
+
+                    root_move = node.root_move
+                    if root_move is None:
+                        root_move = {
+                            'rotation': rotation,
+                            'x': x,
+                            'y': landing_y,
+                            'requires_hold': requires_hold,
+                            'shape': piece_shape,
+                            'type': 'normal'
+                        }
+                    children.append(SearchNode(resulting_board, next_piece, hold, True, next_index + 1, root_move))
+
+        return children
@@ -0,0 +1,113 @@
+# benchmark_network.py
+
+import argparse
+import random
+import time
+from bitboard import Bitboard
+from engine import TetrisEngine
+from neat import Genome, InnovationTracker, load_genome
+from network_evaluator import FEATURES, NetworkEvaluator
+from placement_tables import PLACEMENT_TABLES, legal_x_range
+from tetris_ai import TetrisAI
+
+# Compares the compiled network against running the genome node by node, and
+# against the four-weight evaluate_position, on the candidate boards of real games.
+
+def collect_candidate_sets(positions, seed):
+    """Every placement of the current piece, for positions reached by greedy headless games"""
+    ai = TetrisAI()
+    ai.planner.depth = 1
+    engine = TetrisEngine(seed=seed)
+    candidate_sets = []
+    while len(candidate_sets) < positions:
+        if engine.game_over:
+            seed += 1
+            engine = TetrisEngine(seed=seed)
+        board = Bitboard.from_grid(engine.board)
+        shape = engine.current_piece.shape_name
+        boards = []
+        for rotation in ai.get_reachable_rotations(shape, board):
+            table = PLACEMENT_TABLES[shape][rotation]
+            for x in legal_x_range(table, board.width):
+                landing_y = ai.find_landing_row(table, x, board)
+                if landing_y is not None:
+                    candidate = board.copy()
+                    candidate.lock(table, x, landing_y)
+                    boards.append(candidate)
+        if boards:
+            candidate_sets.append(boards)
+        engine.play_move(ai.get_best_move(engine.board, engine.current_piece))
+    return candidate_sets
+
+
+def random_genome(hidden_nodes, seed):
+    """A genome grown by mutation, for benchmarking without a trained one"""
+    rng = random.Random(seed)
+    tracker = InnovationTracker(next_node=1)
+    genome = Genome.create(0, len(FEATURES), 1, tracker, rng)
+    while len(genome.nodes) - 1 < hidden_nodes:
+        genome.mutate_add_node(tracker, rng)
+        for _ in range(2):
+            genome.mutate_add_connection(tracker, rng)
+    return genome
+
+
+def time_per_set(candidate_sets, function, repeats):
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        for boards in candidate_sets:
+            function(boards)
+    return (time.perf_counter() - start_time) / (repeats * len(candidate_sets)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled network evaluation")
+    parser.add_argument('--genome', default=None, help="Genome file, a random one is grown if not given")
+    parser.add_argument('--hidden', type=int, default=12, help="Hidden nodes in the random genome")
+    parser.add_argument('--positions', type=int, default=200)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    genome = load_genome(args.genome) if args.genome else random_genome(args.hidden, args.seed)
+    evaluator = NetworkEvaluator(genome)
+    ai = TetrisAI()
+    batch = ai.batch_evaluator
+    candidate_sets = collect_candidate_sets(args.positions, args.seed)
+    width = candidate_sets[0][0].width
+    candidates = sum(len(boards) for boards in candidate_sets)
+
+    # The compiled network has to agree with the node by node reference
+    worst = 0.0
+    for boards in candidate_sets:
+        heuristics = batch.calculate_heuristics(batch.stack_boards([b.rows for b in boards], width))
+        compiled = evaluator.evaluate(heuristics)
+        reference = [evaluator.score(ai.calculate_heuristics(b)) for b in boards]
+        worst = max(worst, max(abs(a - b) for a, b in zip(compiled, reference)))
+    if worst > 1e-9:
+        raise Exception(f"Compiled network differs from the reference by {worst}")
+
+    def weights_per_board(boards):
+        return [ai.evaluate_position(b) for b in boards]
+
+    def weights_batched(boards):
+        return batch.evaluate(batch.stack_boards([b.rows for b in boards], width))
+
+    def network_per_node(boards):
+        return [evaluator.score(ai.calculate_heuristics(b)) for b in boards]
+
+    def network_compiled(boards):
+        return evaluator.evaluate(batch.calculate_heuristics(batch.stack_boards([b.rows for b in boards], width)))
+
+    print(f"{len(candidate_sets)} pieces, {candidates / len(candidate_sets):.1f} candidates each, "
+          f"{len(genome.nodes) - genome.num_outputs} hidden nodes, "
+          f"{sum(c.enabled for c in genome.connections.values())} connections, max difference {worst:.2e}")
+    for name, function in (('evaluate_position (weights)', weights_per_board),
+                           ('batched weights', weights_batched),
+                           ('network, node by node', network_per_node),
+                           ('network, compiled', network_compiled)):
+        print(f"  {name:<28} {time_per_set(candidate_sets, function, args.repeats):9.1f} us per piece")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+# benchmarks.py
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from constants import (COLORS, BENCHMARK_CORPUS_FILE, BENCHMARK_RESULTS_FILE, BENCHMARK_BASELINE_FILE,
+                       BENCHMARK_FILL_LEVELS, BENCHMARK_BOARDS_PER_LEVEL, BENCHMARK_REGRESSION_THRESHOLD)
+from engine import TetrisEngine
+from grid import Grid
+from tetromino import Tetromino
+from tetris_ai import TetrisAI
+from score import Score
+from placement_tables import PLACEMENT_TABLES, legal_x_range
+
+# Microbenchmarks for the code that runs every frame or every AI decision.
+# Each one runs over recorded board states at several stack heights and the
+# results are compared against a stored baseline to catch slowdowns.
+#
+# Timings only mean something next to a baseline from the same kind of machine,
+# so a baseline recorded on another architecture or Python version is shown for
+# reference and never fails the run. Otherwise any regression exits with 1.
+# Record a baseline for this machine with: python benchmarks.py --save-baseline
+
+def record_corpus(seed=0):
+    """Play seeded games with random placements and keep boards as the stack passes each fill level"""
+    rng = random.Random(seed)
+    ai = TetrisAI()
+    corpus = {str(level): [] for level in BENCHMARK_FILL_LEVELS}
+    engine = TetrisEngine(seed=seed)
+
+    while any(len(states) < BENCHMARK_BOARDS_PER_LEVEL for states in corpus.values()):
+        if engine.game_over:
+            seed += 1
+            engine = TetrisEngine(seed=seed)
+
+        stack_height = max(engine.board.column_heights)
+        for level in BENCHMARK_FILL_LEVELS:
+            states = corpus[str(level)]
+            if level <= stack_height < level + 2 and len(states) < BENCHMARK_BOARDS_PER_LEVEL:
+                states.append({
+                    'cells': [''.join(cell or '.' for cell in row) for row in engine.board.cells],
+                    'current': engine.current_piece.shape_name,
+                    'preview': engine.preview(),
+                    'hold': engine.held_piece.shape_name if engine.held_piece else None,
+                })
+
+        # Random placements stack up quickly and leave realistic holes
+        moves = ai.generate_possible_moves(engine.board, engine.current_piece)
+        if not moves:
+            engine.game_over = True
+            continue
+        engine.play_move(rng.choice(moves))
+    return corpus
+
+
+def load_corpus(path=BENCHMARK_CORPUS_FILE):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        corpus = record_corpus()
+        save_json(corpus, path)
+        return corpus
+
+
+def save_json(data, path):
+    try:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+    except Exception as e:
+        print(f"Error saving {path}: {e}")
+
+
+def make_grid(state):
+    grid = Grid(10, 20)
+    grid.load_cells([[COLORS[cell] if cell != '.' else 0 for cell in row] for row in state['cells']])
+    return grid
+
+
+def spawn_piece(state, grid):
+    return Tetromino(state['current'], grid)
+
+
+def wall_piece(state, grid):
+    """Current piece pushed against the left wall, where rotations need kicks"""
+    piece = Tetromino(state['current'], grid)
+    while piece.move(-1, 0):
+        pass
+    return piece
+
+
+# Each benchmark takes the states of one fill level and returns (make_cases, call).
+# make_cases builds fresh arguments for one timed run, so calls that change their
+# arguments never see the result of an earlier run.
+
+def bench_is_collision(states):
+    cases = []
+    for state in states:
+        grid = make_grid(state)
+        # The spawn piece at every other row, from free space down into the stack
+        for y in range(-1, grid.height - 1, 2):
+            piece = spawn_piece(state, grid)
+            piece.y = y
+            cases.append((grid, piece))
+    return (lambda: cases), lambda grid, piece: grid.is_collision(piece)
+
+
+def bench_clear_lines(states):
+    def make_cases():
+        return [(make_grid(state),) for state in states]
+    return make_cases, lambda grid: grid.clear_lines()
+
+
+def bench_clear_lines_full_row(states):
+    def make_cases():
+        cases = []
+        for state in states:
+            grid = make_grid(state)
+            cells = [row[:] for row in grid.cells]
+            cells[-1] = [COLORS['I']] * grid.width  # Complete the bottom row
+            grid.load_cells(cells)
+            cases.append((grid,))
+        return cases
+    return make_cases, lambda grid: grid.clear_lines()
+
+
+def bench_rotate(states):
+    def make_cases():
+        cases = []
+        for state in states:
+            grid = make_grid(state)
+            cases.append((spawn_piece(state, grid),))
+            cases.append((wall_piece(state, grid),))
+        return cases
+    return make_cases, lambda piece: piece.rotate()
+
+
+def bench_ghost_position(states):
+    grids = [(make_grid(state), state) for state in states]
+
+    def make_cases():
+        # Fresh pieces have nothing cached, so every call searches for the landing row
+        return [(spawn_piece(state, grid),) for grid, state in grids]
+    return make_cases, lambda piece: piece.get_ghost_position()
+
+
+def bench_simulate_placement(states):
+    ai = TetrisAI()
+    cases = []
+    for state in states:
+        grid = make_grid(state)
+        for rotation, table in enumerate(PLACEMENT_TABLES[state['current']]):
+            for x in legal_x_range(table, grid.width):
+                cases.append((state['current'], rotation, x, grid))
+    return (lambda: cases), ai.simulate_placement
+
+
+def bench_generate_possible_moves(states):
+    ai = TetrisAI()
+    cases = []
+    for state in states:
+        grid = make_grid(state)
+        hold = state['hold'] or state['preview'][0]
+        cases.append((grid, state['current'], hold, True))
+
+    def call(grid, piece, hold, can_hold):
+        ai.evaluation_cache.clear()  # Every call should score its boards from scratch
+        return ai.generate_possible_moves(grid, piece, hold, can_hold)
+    return (lambda: cases), call
+
+
+def bench_get_best_move(states):
+    ai = TetrisAI()
+    cases = []
+    for state in states:
+        grid = make_grid(state)
+        cases.append((grid, spawn_piece(state, grid), state['hold'], state['preview'], True))
+
+    def call(grid, piece, hold, preview, can_hold):
+        ai.evaluation_cache.clear()
+        ai.search_cache.clear()
+        return ai.get_best_move(grid, piece, hold, preview, can_hold)
+    return (lambda: cases), call
+
+
+def bench_score_update(states):
+    updates = [(lines, t_spin, False, drop, drop // 2, drop)
+               for lines in range(5) for t_spin in (False, 'mini', 'normal') for drop in (0, 12)
+               if not (t_spin == 'mini' and lines > 2) and not (t_spin and lines > 3)]
+
+    def make_cases():
+        score = Score()
+        return [(score,) + update for update in updates]
+    return make_cases, lambda score, *update: score.update(*update)
+
+
+# (name, benchmark, whether it depends on the board and runs once per fill level)
+BENCHMARKS = [
+    ('grid.is_collision', bench_is_collision, True),
+    ('grid.clear_lines', bench_clear_lines, True),
+    ('grid.clear_lines_full_row', bench_clear_lines_full_row, True),
+    ('tetromino.rotate', bench_rotate, True),
+    ('tetromino.get_ghost_position', bench_ghost_position, True),
+    ('ai.simulate_placement', bench_simulate_placement, True),
+    ('ai.generate_possible_moves', bench_generate_possible_moves, True),
+    ('ai.get_best_move', bench_get_best_move, True),
+    ('score.update', bench_score_update, False),
+]
+
+
+def time_calls(make_cases, call, repeats, min_time=0.1):
+    """Best average microseconds per call over several timed runs"""
+    best = None
+    for _ in range(repeats):
+        calls = 0
+        elapsed = 0
+        # Keep going over fresh cases until the run is long enough to time reliably
+        while elapsed < min_time:
+            cases = make_cases()
+            start_time = time.perf_counter()
+            for case in cases:
+                call(*case)
+            elapsed += time.perf_counter() - start_time
+            calls += len(cases)
+        per_call = elapsed / calls * 1e6
+        best = per_call if best is None else min(best, per_call)
+    return best
+
+
+def run_benchmarks(corpus, repeats=5, only=None):
+    results = {}
+    for name, benchmark, per_level in BENCHMARKS:
+        if only and not any(part in name for part in only):
+            continue
+        results[name] = {}
+        groups = corpus.items() if per_level else [('all', [s for states in corpus.values() for s in states])]
+        for level, states in groups:
+            make_cases, call = benchmark(states)
+            results[name][level] = round(time_calls(make_cases, call, repeats), 3)
+        print(f"{name:<32}" + "".join(f"{level:>6}: {us:>10.2f} us" for level, us in results[name].items()))
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'host': platform.node(),
+        'repeats': repeats,
+        'results': results,
+    }
+
+
+def same_machine(results, baseline):
+    """Whether the baseline came from the same architecture and Python version, the host is only informational"""
+    return all(results.get(key) == baseline.get(key) for key in ('machine', 'python'))
+
+
+def compare(results, baseline, threshold=BENCHMARK_REGRESSION_THRESHOLD):
+    """Print each benchmark's ratio to the baseline and return the regressions"""
+    regressions = []
+    for name, levels in results['results'].items():
+        for level, us in levels.items():
+            base_us = baseline['results'].get(name, {}).get(level)
+            if not base_us:
+                continue
+            ratio = us / base_us
+            flag = "  REGRESSION" if ratio > threshold else ""
+            print(f"{name:<32}{level:>6}: {base_us:>10.2f} -> {us:>10.2f} us  x{ratio:5.2f}{flag}")
+            if ratio > threshold:
+                regressions.append((name, level, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the engine and AI hot paths")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--only', action='append', help="Run benchmarks whose name contains this, can be repeated")
+    parser.add_argument('--output', default=BENCHMARK_RESULTS_FILE)
+    parser.add_argument('--baseline', default=BENCHMARK_BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the new baseline")
+    parser.add_argument('--record-corpus', action='store_true', help="Record the board corpus again")
+    args = parser.parse_args()
+
+    if args.record_corpus:
+        save_json(record_corpus(), BENCHMARK_CORPUS_FILE)
+    results = run_benchmarks(load_corpus(), args.repeats, args.only)
+    save_json(results, args.output)
+
+    if args.save_baseline:
+        save_json(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}, run with --save-baseline to create one")
+        return
+
+    print()
+    regressions = compare(results, baseline)
+    if not same_machine(results, baseline):
+        print(f"The baseline was recorded on {baseline.get('machine')} with Python "
+              f"{baseline.get('python')}, so the ratios are only a rough guide. "
+              f"Run with --save-baseline to record one here.")
+        return
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than x{BENCHMARK_REGRESSION_THRESHOLD}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# bitboard.py
+
+######################################
+# GROUP A SKILL : Bitwise Operations #
+######################################
+
+class Bitboard:
+    """Board where every row is stored as an integer occupancy mask (bit x = column x)"""
+    def __init__(self, width, height, rows=None):
+        self.width = width
+        self.height = height
+        self.full_row = (1 << width) - 1
+        self.rows = list(rows) if rows is not None else [0] * height
+
+    @classmethod
+    def from_cells(cls, cells):
+        """Build a bitboard from a 2D list of cells (any truthy value is filled)"""
+        rows = []
+        for row in cells:
+            mask = 0
+            for x, cell in enumerate(row):
+                if cell:
+                    mask |= 1 << x
+            rows.append(mask)
+        return cls(len(cells[0]), len(cells), rows)
+
+    @classmethod
+    def from_grid(cls, grid):
+        return cls.from_cells(grid.cells)
+
+    def copy(self):
+        return Bitboard(self.width, self.height, self.rows)
+
+    def to_cells(self):
+        """Convert back into a 2D binary array"""
+        return [[(row >> x) & 1 for x in range(self.width)] for row in self.rows]
+
+    def is_collision(self, piece, x, y):
+        """Check a rotation table whose shape matrix has its top-left corner at (x, y)"""
+        shift = x + piece.left
+        if shift < 0 or x + piece.right >= self.width:
+            return True
+        rows = self.rows
+        for dy, mask in piece.rows:
+            row = y + dy
+            if row >= self.height:
+                return True
+            if row >= 0 and rows[row] & (mask << shift):
+                return True
+        return False
+
+    def drop(self, piece, x, y=0):
+        """Return the row the piece comes to rest on when falling from y"""
+        shift = x + piece.left
+        rows = self.rows
+        shifted = [(dy, mask << shift) for dy, mask in piece.rows]
+        # The bottom row of the piece hits the floor first
+        lowest_y = self.height - 1 - piece.rows[-1][0]
+        while y < lowest_y:
+            for dy, mask in shifted:
+                row = y + 1 + dy
+                if row >= 0 and rows[row] & mask:
+                    return y
+            y += 1
+        return y
+
+    def drop_onto_surface(self, piece, x, tops):
+        """Landing row for a piece falling from y=0, using each column's top filled row"""
+        landing_y = self.height
+        for dx, bottom in piece.bottoms:
+            top = tops[x + dx]
+            if top <= bottom:
+                # Something overhangs the piece's starting rows, fall back to stepping down
+                return self.drop(piece, x, 0)
+            if top - 1 - bottom < landing_y:
+                landing_y = top - 1 - bottom
+        return landing_y
+
+    def lock(self, piece, x, y):
+        shift = x + piece.left
+        for dy, mask in piece.rows:
+            if y + dy >= 0:
+                self.rows[y + dy] |= mask << shift
+
+    def clear_lines(self):
+        """Remove full rows and return how many were cleared"""
+        remaining = [row for row in self.rows if row != self.full_row]
+        lines_cleared = self.height - len(remaining)
+        if lines_cleared:
+            self.rows = [0] * lines_cleared + remaining
+        return lines_cleared
+
+    def column_profile(self):
+        """Return (heights, filled) per column, where filled counts blocks in the column"""
+        heights = [0] * self.width
+        filled = [0] * self.width
+        seen = 0  # Columns that already have a block above the current row
+        for y, row in enumerate(self.rows):
+            if not row:
+                continue
+            new_columns = row & ~seen
+            while new_columns:
+                bit = new_columns & -new_columns
+                heights[bit.bit_length() - 1] = self.height - y
+                new_columns ^= bit
+            seen |= row
+            while row:
+                bit = row & -row
+                filled[bit.bit_length() - 1] += 1
+                row ^= bit
+        return heights, filled
@@ -1,14 +1,14 @@
 # button.py
 
 import pygame
-from constants import BUTTON_COLOR, BUTTON_HOVER_COLOR, BUTTON_TEXT_COLOR, FONT_NAME, FONT_SIZE, BUTTON_WIDTH, BUTTON_HEIGHT
+from constants import BUTTON_COLOR, BUTTON_HOVER_COLOR, BUTTON_TEXT_COLOR, FONT_SIZE, BUTTON_WIDTH, BUTTON_HEIGHT
+from text_cache import render_text
 
 class Button:
     def __init__(self, rect, text, action=None):
         self.rect = pygame.Rect(rect)
         self.text = text
         self.action = action
-        self.font = pygame.font.Font(FONT_NAME, FONT_SIZE)
         self.hovered = False
 
         # For smooth color transition
@@ -26,8 +26,8 @@ class Button:
         pygame.draw.rect(screen, self.current_color, self.rect)
         pygame.draw.rect(screen, BUTTON_TEXT_COLOR, self.rect, 2)
 
-        # Render the text
-        text_surf = self.font.render(self.text, True, BUTTON_TEXT_COLOR)
+        # Labels are shared through the text cache, so only the first draw renders them
+        text_surf = render_text(self.text, FONT_SIZE, BUTTON_TEXT_COLOR)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
 
@@ -1,7 +1,5 @@
 # constants.py
 
-import pygame
-
 # Screen dimensions
 SCREEN_WIDTH = 1600
 SCREEN_HEIGHT = 800
@@ -94,6 +92,7 @@ LINES_PER_LEVEL = 10
 # Fonts
 FONT_NAME = None  # Default font
 FONT_SIZE = 36
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept around, least recently used are dropped first
 
 # Menu dimensions
 MENU_BACKGROUND_COLOR = (30, 30, 30)
@@ -109,6 +108,15 @@ GHOST_ALPHA = 50  # Transparency level (0-255)
 # High Score Constants
 HIGH_SCORE_FILE = 'highscores.json'
 MAX_HIGH_SCORES = 5
+AI_SCORE_FILE = 'ai_scores.jsonl'          # Snapshot of the AI game results
+AI_SCORE_LOG_FILE = 'ai_scores.log.jsonl'  # Games added since the snapshot, one line each
+AI_SCORE_COMPACT_EVERY = 500               # Fold the log into the snapshot after this many games
+SCORE_BACKEND = 'json'                     # 'json' files, or 'sqlite' to keep every game in SCORE_DATABASE_FILE
+SCORE_DATABASE_FILE = 'scores.db'
+SCORE_DATABASE_ENCRYPT_NAMES = True        # Encrypt player names in the database with HIGH_SCORE_ENCRYPTION_KEY,
+                                           # scores stay readable and are sealed against editing instead
+SCORE_BACKGROUND_WRITES = True             # Write score files on a background thread, False writes them straight away
+SCORE_WRITE_QUEUE_SIZE = 64                # Saves waiting for the writer before new ones have to wait
 
 # Animation constants
 ANIMATION_SPEED = 0.5  # Slow - 0.0, Fast - 1.0
@@ -126,5 +134,69 @@ INITIAL_DELAY = 170  # Milliseconds before key repeat starts
 REPEAT_DELAY = 50    # Milliseconds between repeated movements
 AI_MOVE_DELAY = 0  # Milliseconds between AI moves
 
+# Piece sequence
+PIECE_SEED = None            # Fixed seed for every game's pieces, None picks a new one each game
+AI_SHARED_PIECE_SEED = True  # In AI mode the player and AI get the same pieces
+
+# AI lookahead search
+AI_SEARCH_DEPTH = 2  # Pieces planned ahead, 1 = greedy on the current piece
+AI_BEAM_WIDTH = 8    # Boards kept at each depth of the search
+AI_EVALUATION_CACHE_SIZE = 100000  # Board scores kept in the transposition table
+AI_SEARCH_CACHE_SIZE = 10000       # Finished searches kept in the transposition table
+AI_ASYNC_PLANNING = True  # Run AI searches on a background thread instead of inside Game.update
+AI_PLAN_DEADLINE = 50     # Milliseconds before settling for the deepest search finished so far
+
+# Headless self-play
+SELF_PLAY_GAMES = 100        # Games per batch
+SELF_PLAY_MAX_PIECES = 1000  # Pieces before a game is stopped, 0 plays until top out
+SELF_PLAY_BASE_SEED = 0      # Seed of the first game, the rest count up from it
+
+# NEAT training
+AI_GENOME_FILE = None  # Genome exported by neat_trainer.py for TetrisAI to score boards with, None uses the weights
+NEAT_GENOME_FILE = 'best_genome.json'  # Where the trainer saves the best genome
+NEAT_POPULATION_SIZE = 50
+NEAT_GENERATIONS = 30
+NEAT_GAMES_PER_GENOME = 3   # Seeded games averaged for each genome's fitness, new seeds every generation
+NEAT_HELD_OUT_GAMES = 5     # Fixed games every generation's champion is scored on, never trained on
+NEAT_MAX_PIECES = 300       # Piece cap for training games
+NEAT_COMPATIBILITY_THRESHOLD = 1.0  # Genomes closer than this share a species
+NEAT_DISJOINT_COEFFICIENT = 1.0
+NEAT_WEIGHT_COEFFICIENT = 0.5
+NEAT_ADD_NODE_RATE = 0.03
+NEAT_ADD_CONNECTION_RATE = 0.05
+NEAT_WEIGHT_MUTATE_RATE = 0.8   # Chance each weight is nudged
+NEAT_WEIGHT_REPLACE_RATE = 0.1  # Chance each weight is replaced outright
+NEAT_WEIGHT_PERTURB = 0.5       # Standard deviation of a nudge
+NEAT_TOGGLE_RATE = 0.01
+NEAT_CROSSOVER_RATE = 0.75
+NEAT_ELITISM = 1               # Best genomes per species copied unchanged
+NEAT_SURVIVAL_THRESHOLD = 0.2  # Fraction of each species allowed to breed
+NEAT_STAGNATION = 15           # Generations without improvement before a species is removed
+NEAT_SPECIES_ELITISM = 2       # Best species are never removed for stagnating
+NEAT_MIN_SPECIES_SIZE = 2
+
+# Benchmarks
+BENCHMARK_CORPUS_FILE = 'benchmark_corpus.json'      # Recorded board states the benchmarks run over
+BENCHMARK_RESULTS_FILE = 'benchmark_results.json'
+BENCHMARK_BASELINE_FILE = 'benchmark_baseline.json'
+BENCHMARK_FILL_LEVELS = (2, 6, 10, 14)  # Stack heights recorded in the corpus
+BENCHMARK_BOARDS_PER_LEVEL = 8
+BENCHMARK_REGRESSION_THRESHOLD = 1.25   # Slower than the baseline by this factor counts as a regression
+
+# Frame timing
+SHOW_PERF_OVERLAY = False  # Start with the frame timing overlay visible, F3 toggles it in game
+FRAME_STATS_WINDOW = 600   # Frames the rolling percentiles cover
+FRAME_TIMING_CSV = None    # File to write every frame's phase timings to, None disables it
+
+# Rendering
+DIRTY_RECT_RENDERING = True  # Only push changed areas to the display during play, False flips every frame
+
+# Particles
+PARTICLE_CAPACITY = 2048   # Most particles alive at once, bursts past this are cut short
+PARTICLES_PER_BLOCK = 5    # Spawned for every block in a cleared line
+PARTICLE_GRAVITY = 400
+PARTICLE_ALPHA_LEVELS = 16          # Fade steps each particle sprite is pre-rendered at
+PARTICLE_SPRITE_CACHE_SIZE = 1024   # Sprites kept, enough for every block color at every size and fade step
+
 # Encryption key
 HIGH_SCORE_ENCRYPTION_KEY = "PiDWyn1yjbD6trGLRnYr2umUh3CKaQbDGihGHcw-dc0="
\ No newline at end of file
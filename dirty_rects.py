@@ -0,0 +1,38 @@
+# dirty_rects.py
+
+import pygame
+from constants import DIRTY_RECT_RENDERING
+
+class DirtyRects:
+    """Collects the screen areas drawn this frame so only those are pushed to the display"""
+    def __init__(self, enabled=DIRTY_RECT_RENDERING):
+        self.enabled = enabled
+        self.rects = []
+        self.previous = []  # Last frame's areas, whatever was drawn there may have moved away
+        self.full_update = True
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def add(self, rects):
+        """Report a Rect, a list of Rects, or None for nothing drawn"""
+        if rects is None:
+            return
+        if isinstance(rects, pygame.Rect):
+            self.rects.append(rects)
+        else:
+            self.rects.extend(rect for rect in rects if rect)
+
+    def request_full_update(self):
+        self.full_update = True
+
+    def present(self):
+        """Show the frame, flipping the whole display only when asked to"""
+        if self.full_update or not self.enabled:
+            pygame.display.flip()
+            self.full_updates += 1
+        else:
+            pygame.display.update(self.previous + self.rects)
+            self.partial_updates += 1
+        self.previous = self.rects
+        self.rects = []
+        self.full_update = False
@@ -0,0 +1,386 @@
+# engine.py
+
+import copy
+from constants import WALL_KICK_DATA
+from placement_tables import PLACEMENT_TABLES
+from score import Score
+from shape_stream import ShapeStream
+
+# Pure game rules with no pygame or screen layout, so games can run headless.
+# Grid and Tetromino extend Board and Piece with drawing and animation.
+
+class Board:
+    def __init__(self, width, height):
+
+        #####################################
+        # GROUP A SKILL : Complex Structure #
+        #####################################
+
+        self.width = width
+        self.height = height
+        self.cells = [[0 for _ in range(width)] for _ in range(height)]
+        self.lines_to_clear = []
+        self.version = 0  # Bumped whenever the cells change, so pieces know when cached results are stale
+
+        # Column statistics kept up to date by lock_piece and clear_lines
+        self._column_heights = [0] * width
+        self._column_holes = [0] * width  # Empty cells below each column's top block
+        self._top_row = height  # Highest filled row, height when the board is empty
+
+    @property
+    def column_heights(self):
+        return tuple(self._column_heights)
+
+    @property
+    def column_holes(self):
+        return tuple(self._column_holes)
+
+    @property
+    def top_row(self):
+        return self._top_row
+
+    def cell_value(self, piece):
+        """What gets stored in a cell when a piece locks there"""
+        return piece.shape_name
+
+    def load_cells(self, cells):
+        """Replace every cell at once, recomputing the column statistics"""
+        self.cells = [list(row) for row in cells]
+        self.version += 1
+        for x in range(self.width):
+            self._rescan_column(x)
+        self._top_row = self.height - max(self._column_heights)
+
+    def is_collision(self, piece):
+        for x, y in piece.get_block_positions():
+            if x < 0 or x >= self.width or y >= self.height:
+                return True
+            # Nothing above the top filled row can collide
+            if y >= self._top_row and self.cells[y][x]:
+                return True
+        return False
+
+    def lock_piece(self, piece):
+        value = self.cell_value(piece)
+        self.version += 1
+        for x, y in piece.get_block_positions():
+            if y >= 0:
+                self.cells[y][x] = value
+                cell_height = self.height - y
+                if cell_height > self._column_heights[x]:
+                    # Cells between the old top and the new block become holes
+                    self._column_holes[x] += cell_height - self._column_heights[x] - 1
+                    self._column_heights[x] = cell_height
+                else:
+                    # The block filled one of the column's holes
+                    self._column_holes[x] -= 1
+                self._top_row = min(self._top_row, y)
+
+    def find_full_lines(self):
+        """Rows that are completely filled, bottom to top"""
+        return [y for y in range(self.height - 1, self._top_row - 1, -1) if all(self.cells[y])]
+
+    def clear_lines(self):
+        self.lines_to_clear = self.find_full_lines()
+        lines_cleared = len(self.lines_to_clear)
+        if self.lines_to_clear:
+            self.remove_lines()
+        return lines_cleared
+
+    def remove_lines(self):
+        new_cells = [[0 for _ in range(self.width)] for _ in range(len(self.lines_to_clear))]
+        old_cells = [row for i, row in enumerate(self.cells) if i not in self.lines_to_clear]
+        self.cells = new_cells + old_cells
+        self.version += 1
+
+        # Cleared rows are full, so every column's top is at or above the highest one
+        highest_cleared = min(self.lines_to_clear)
+        for x in range(self.width):
+            if self.height - self._column_heights[x] < highest_cleared:
+                # The rest of the column just shifts down
+                self._column_heights[x] -= len(self.lines_to_clear)
+            else:
+                # The column's top block was cleared, find the new one
+                self._rescan_column(x)
+        self._top_row = self.height - max(self._column_heights)
+        self.lines_to_clear = []
+
+    def _rescan_column(self, x):
+        self._column_heights[x] = 0
+        self._column_holes[x] = 0
+        for y in range(self.height):
+            if self.cells[y][x]:
+                self._column_heights[x] = self.height - y
+                self._column_holes[x] = sum(1 for row in self.cells[y:] if not row[x])
+                break
+
+    def is_board_clear(self):
+        """Check if the entire board is clear"""
+        return self._top_row == self.height
+
+
+class Piece:
+    """Only the shape, rotation and position, the rotated matrices are shared by every piece"""
+    def __init__(self, shape_name, board):
+        self.shape_name = shape_name
+        self.grid = board
+        self.reset_position()
+
+    @property
+    def table(self):
+        return PLACEMENT_TABLES[self.shape_name][self.rotation_state]
+
+    @property
+    def shape(self):
+        return self.table.matrix
+
+    def reset_position(self):
+        """Reset the piece to starting position"""
+        self.rotation_state = 0
+        self.x = self.grid.width // 2 - len(self.shape[0]) // 2
+        self.y = -1
+
+    def move(self, dx, dy):
+        old_x, old_y = self.x, self.y
+        self.x += dx
+        self.y += dy
+
+        if self.grid.is_collision(self):
+            self.x, self.y = old_x, old_y
+            return False
+        return True
+
+    def rotate(self, clockwise=True, use_wall_kicks=True):
+        """Rotate the piece with optional wall kick handling"""
+        # Store original state
+        original_x = self.x
+        original_y = self.y
+        original_rotation_state = self.rotation_state
+
+        # The rotated matrices are precomputed, turning is just a change of index
+        if clockwise:
+            self.rotation_state = (self.rotation_state + 1) % 4
+        else:
+            self.rotation_state = (self.rotation_state - 1) % 4
+
+        new_rotation_state = self.rotation_state
+
+        # First, try the basic rotation
+        if not self.grid.is_collision(self):
+            return True
+
+        # If basic rotation fails, try wall kicks if allowed
+        if use_wall_kicks and self.wall_kick(original_rotation_state, new_rotation_state):
+            return True
+
+        # If all attempts fail, revert to original state
+        self.x = original_x
+        self.y = original_y
+        self.rotation_state = original_rotation_state
+        return False
+
+    def wall_kick(self, old_rotation_state, new_rotation_state):
+        """Handle wall kicks according to SRS"""
+        if self.shape_name == 'O':
+            return False  # O piece doesn't need wall kicks
+
+        # Get the appropriate kick data
+        kick_data = WALL_KICK_DATA['I'] if self.shape_name == 'I' else WALL_KICK_DATA['JLSTZ']
+
+        # Get the key for wall kick data
+        key = (old_rotation_state, new_rotation_state)
+
+        # Get the kick tests for this rotation
+        kick_tests = kick_data.get(key, [])
+
+        # Try each kick test
+        for dx, dy in kick_tests:
+            # Store original position
+            original_x = self.x
+            original_y = self.y
+
+            # Apply offset
+            self.x += dx
+            self.y += dy
+
+            # Check if this position works
+            if not self.grid.is_collision(self):
+                return True
+
+            self.x = original_x
+            self.y = original_y
+
+        return False
+
+    def is_touching_ground(self):
+        # Check if piece is touching ground or other pieces
+        self.y += 1
+        collision = self.grid.is_collision(self)
+        self.y -= 1
+        return collision
+
+    def hard_drop(self):
+        drop_distance = 0
+        while not self.grid.is_collision(self):
+            self.y += 1
+            drop_distance += 1
+        self.y -= 1
+        return drop_distance - 1
+
+    def get_block_positions(self):
+        return [(self.x + x, self.y + y) for x, y in self.table.cells]
+
+
+def lock_and_clear(board, piece, on_clear=None):
+    """Lock the piece and clear full lines, calling on_clear with the full rows before they're removed"""
+    board.lock_piece(piece)
+    full_lines = board.find_full_lines()
+    if full_lines and on_clear is not None:
+        on_clear(full_lines)
+    return board.clear_lines()
+
+
+def lock_and_score(board, piece, score, t_spin_type=False, soft_drop_count=0, hard_drop_count=0, on_clear=None):
+    """Lock the piece, clear full lines and score the placement by the player's rules.
+
+    Returns (lines cleared, notifications).
+    """
+    lines_cleared = lock_and_clear(board, piece, on_clear)
+    _, notifications = score.update(lines_cleared, t_spin_type, False, hard_drop_count, soft_drop_count, hard_drop_count)
+    if lines_cleared and board.is_board_clear():
+        score.add_tetris_clear_bonus()
+    return lines_cleared, notifications
+
+
+def ai_lock_and_score(board, piece, score, drop_distance, on_clear=None):
+    """Lock, clear and score the in-game AI's placement by the rules its leaderboard was recorded with.
+
+    The hard drop is scored at double weight before the clear and again with it, which also restarts
+    the combo every piece. Returns (lines cleared, notifications).
+    """
+    lines_cleared = lock_and_clear(board, piece, on_clear)
+    _, notifications = score.update(0, False, False, drop_distance, 0, drop_distance * 2)
+    if lines_cleared:
+        _, notifications = score.update(lines_cleared, False, False, drop_distance, 0, drop_distance * 2)
+        if board.is_board_clear():
+            score.add_tetris_clear_bonus()
+    return lines_cleared, notifications
+
+
+def swap_hold(piece, held_piece, next_piece):
+    """Hold the piece, returning (piece to play, held piece). next_piece() deals the piece for the first hold."""
+    piece.reset_position()  # The held piece goes back to its spawn rotation and position
+    if held_piece is None:
+        return next_piece(), piece
+    return held_piece, piece
+
+
+def move_steps(piece, move):
+    """The single steps that carry out a TetrisAI move dict: 'hold', or rotations then shifts then 'drop'"""
+    if move['requires_hold']:
+        return ['hold']
+
+    # Rotate a copy first so wall kicks are accounted for when counting the shifts
+    test_piece = copy.copy(piece)
+    steps = []
+    for _ in range(4):
+        if test_piece.rotation_state == move['rotation'] or not test_piece.rotate():
+            break
+        steps.append('rotate')
+
+    shift = move['x'] - test_piece.x
+    steps.extend(['right'] * shift if shift > 0 else ['left'] * -shift)
+    steps.append('drop')
+    return steps
+
+
+class TetrisEngine:
+    """A complete single-player game driven by method calls instead of key presses and frames"""
+    def __init__(self, width=10, height=20, seed=None, queue_size=5):
+        self.board = Board(width, height)
+        self.shapes = ShapeStream(seed)  # Same seeded sequence as PieceGenerator
+        self.queue_size = queue_size
+        self.next_pieces = [self.shapes.next_shape() for _ in range(queue_size)]
+        self.score = Score()
+        self.current_piece = None
+        self.held_piece = None
+        self.can_hold = True
+        self.game_over = False
+        self.pieces_placed = 0
+        self.lines_cleared = 0
+        self.soft_drop_count = 0
+        self.spawn()
+
+    def next_piece(self):
+        shape_name = self.next_pieces.pop(0)
+        self.next_pieces.append(self.shapes.next_shape())
+        return Piece(shape_name, self.board)
+
+    def spawn(self, piece=None):
+        """Bring in the next piece (or the given one), ending the game if it doesn't fit"""
+        self.current_piece = piece or self.next_piece()
+        if self.board.is_collision(self.current_piece):
+            self.game_over = True
+        return not self.game_over
+
+    def preview(self):
+        return list(self.next_pieces)
+
+    def move(self, dx):
+        return not self.game_over and self.current_piece.move(dx, 0)
+
+    def rotate(self, clockwise=True):
+        return not self.game_over and self.current_piece.rotate(clockwise)
+
+    def soft_drop(self):
+        if not self.game_over and self.current_piece.move(0, 1):
+            self.soft_drop_count += 1
+            return True
+        return False
+
+    def hold(self):
+        """Store the current piece, swapping with the held piece if there is one"""
+        if self.game_over or not self.can_hold:
+            return False
+        piece, self.held_piece = swap_hold(self.current_piece, self.held_piece, self.next_piece)
+        self.spawn(piece)
+        self.can_hold = False
+        return True
+
+    def hard_drop(self):
+        """Drop and lock the current piece, returning the number of lines cleared"""
+        if self.game_over:
+            return 0
+        drop_distance = self.current_piece.hard_drop()
+        return self.lock(drop_distance)
+
+    def lock(self, hard_drop_distance=0):
+        lines_cleared, _ = lock_and_score(self.board, self.current_piece, self.score,
+                                          soft_drop_count=self.soft_drop_count, hard_drop_count=hard_drop_distance)
+
+        self.pieces_placed += 1
+        self.lines_cleared += lines_cleared
+        self.soft_drop_count = 0
+        self.can_hold = True
+        self.spawn()
+        return lines_cleared
+
+    def step(self, action):
+        """Carry out one of the steps from move_steps, returning whether it happened"""
+        if action == 'hold':
+            return self.hold()
+        if action == 'rotate':
+            return self.rotate()
+        if action == 'right':
+            return self.move(1)
+        if action == 'left':
+            return self.move(-1)
+        self.hard_drop()
+        return True
+
+    def play_move(self, move):
+        """Carry out a TetrisAI move dict with the same steps the game replays one per tick"""
+        done = False
+        for action in move_steps(self.current_piece, move):
+            done = self.step(action)
+        return done
@@ -0,0 +1,115 @@
+# frame_timer.py
+
+import atexit
+import csv
+import time
+from collections import deque
+from contextlib import contextmanager
+import pygame
+from constants import COLORS, FRAME_STATS_WINDOW, FRAME_TIMING_CSV, SHOW_PERF_OVERLAY
+from text_cache import TEXT_CACHE, get_font
+
+# Phases timed every frame. 'ai' and 'particles_update' happen inside 'update', 'hud' and
+# 'particles_draw' inside 'draw', and 'frame' is the whole frame including the wait in clock.tick.
+FRAME_PHASES = ('frame', 'events', 'update', 'ai', 'particles_update', 'draw', 'hud', 'particles_draw',
+                'flip', 'tick')
+
+
+class FrameTimer:
+    """Times each phase of every frame and keeps rolling percentiles of the last few hundred frames"""
+    def __init__(self, window=FRAME_STATS_WINDOW, csv_path=FRAME_TIMING_CSV):
+        self.samples = {name: deque(maxlen=window) for name in FRAME_PHASES}
+        self.current = {}  # Milliseconds spent in each phase this frame
+        self.frame_start = None
+        self.frame_count = 0
+        self.show_overlay = SHOW_PERF_OVERLAY
+        self.overlay_lines = []  # Rendered text, refreshed a few times a second
+        self.overlay_background = None  # Rebuilt only when the number of lines changes
+        self.font = None
+
+        self.csv_file = None
+        self.csv_writer = None
+        if csv_path:
+            self.open_csv(csv_path)
+
+    def open_csv(self, path):
+        try:
+            self.csv_file = open(path, 'w', newline='')
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(('frame_index',) + tuple(f'{name}_ms' for name in FRAME_PHASES))
+            atexit.register(self.close)  # The game exits straight from its event handling
+        except Exception as e:
+            print(f"Error opening frame timing file: {e}")
+            self.csv_file = None
+            self.csv_writer = None
+
+    def close(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
+
+    def begin_frame(self):
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        """Add the time spent inside the with block to this frame's total for the phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] = self.current.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        self.current['frame'] = (time.perf_counter() - self.frame_start) * 1000
+        for name in FRAME_PHASES:
+            self.samples[name].append(self.current.get(name, 0.0))
+        if self.csv_writer is not None:
+            self.csv_writer.writerow([self.frame_count] + [round(self.current.get(name, 0.0), 4)
+                                                          for name in FRAME_PHASES])
+        self.frame_count += 1
+
+    def percentiles(self, name):
+        """(p50, p95, p99) in milliseconds over the rolling window"""
+        values = sorted(self.samples[name])
+        if not values:
+            return 0.0, 0.0, 0.0
+        last = len(values) - 1
+        return tuple(values[min(last, int(fraction * len(values)))] for fraction in (0.50, 0.95, 0.99))
+
+    def stats(self):
+        return {name: self.percentiles(name) for name in FRAME_PHASES}
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        self.overlay_lines = []
+
+    def draw(self, screen):
+        """Draw the overlay if it's visible, returning the area it covers"""
+        if not self.show_overlay:
+            return None
+        if self.font is None:
+            self.font = get_font(16)
+
+        # Sorting the window and rendering text every frame would show up in the numbers it reports
+        if not self.overlay_lines or self.frame_count % 15 == 0:
+            lines = ["phase              p50     p95     p99 ms"]
+            for name in FRAME_PHASES:
+                p50, p95, p99 = self.percentiles(name)
+                lines.append(f"{name:<16}{p50:7.2f} {p95:7.2f} {p99:7.2f}")
+            lines.append(f"text cache {TEXT_CACHE.hit_rate():6.1%} hits, {len(TEXT_CACHE)} kept")
+            self.overlay_lines = [self.font.render(line, True, COLORS['white']) for line in lines]
+
+        line_height = self.font.get_linesize()
+        height = line_height * len(self.overlay_lines) + 10
+        if self.overlay_background is None or self.overlay_background.get_height() != height:
+            self.overlay_background = pygame.Surface((260, height), pygame.SRCALPHA)
+            self.overlay_background.fill((0, 0, 0, 180))
+        rect = screen.blit(self.overlay_background, (5, 5))
+        for i, line in enumerate(self.overlay_lines):
+            screen.blit(line, (10, 10 + i * line_height))
+        return rect
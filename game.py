@@ -2,6 +2,7 @@
 
 import pygame
 from grid import Grid
+from engine import lock_and_score, ai_lock_and_score, swap_hold, move_steps
 from piece_generator import PieceGenerator
 from score import Score
 from hud import HUD
@@ -10,16 +11,20 @@ from button import Button
 from high_score import HighScore
 from input_box import InputBox
 from constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, COLORS, FONT_NAME,
+    SCREEN_WIDTH, SCREEN_HEIGHT, COLORS,
     INITIAL_DROP_SPEED, MIN_DROP_SPEED, SPEED_INCREMENT, GHOST_ALPHA,
-    LOCK_DELAY, MAX_LOCK_MOVES, INITIAL_DELAY, REPEAT_DELAY, AI_MOVE_DELAY
+    LOCK_DELAY, MAX_LOCK_MOVES, INITIAL_DELAY, REPEAT_DELAY, AI_MOVE_DELAY,
+    AI_ASYNC_PLANNING, AI_PLAN_DEADLINE, PIECE_SEED, AI_SHARED_PIECE_SEED, PARTICLES_PER_BLOCK
 )
-from tetromino import Tetromino
 from particle import ParticleSystem
 import random
 from transition import Transition
 from tetris_ai import TetrisAI
+from ai_worker import AsyncPlanner
 from ai_score import AIScore
+from frame_timer import FrameTimer
+from dirty_rects import DirtyRects
+from text_cache import render_text
 
 
 class Game:
@@ -32,6 +37,7 @@ class Game:
         self.grid = None
         self.piece_generator = None
         self.ai_piece_generator = None  # Separate piece generator for AI
+        self.piece_seed = None  # Seed of the current game's piece sequence
         self.current_piece = None
         self.next_pieces = None
         self.score = None
@@ -42,7 +48,6 @@ class Game:
         self.drop_speed = INITIAL_DROP_SPEED
         self.last_update_time = pygame.time.get_ticks()
         self.soft_drop_count = 0
-        self.drop_height = 0
         self.last_rotation = False
         self.last_move_was_rotation = False
         self.hard_drop_count = 0
@@ -55,7 +60,7 @@ class Game:
         self.countdown_timer = None
         self.held_piece = None
         self.can_hold = True # Bool means can only use once per round
-        self.ai = TetrisAI(self)
+        self.ai = TetrisAI()
         self.ai_grid = None
         self.ai_score = None
         self.ai_current_piece = None
@@ -63,6 +68,10 @@ class Game:
         self.ai_held_piece = None
         self.ai_move_timer = 0  # Timer for AI move delay
         self.ai_move_delay = AI_MOVE_DELAY  # Use the configurable AI move delay
+        self.ai_plan = None  # Remaining steps ('rotate', 'left', 'right', 'drop', 'hold') for the AI piece
+        self.ai_plan_piece = None  # Piece the plan was made for
+        self.ai_async_planner = AsyncPlanner(self.ai, AI_PLAN_DEADLINE) if AI_ASYNC_PLANNING else None
+        self.ai_pending_piece = None  # Piece the background search is running for
         self.ai_game_timer = 60  # 60 seconds for AI game mode
         self.ai_game_started = False
         self.keys_per_piece = []  # List to store number of keys for each piece
@@ -71,6 +80,11 @@ class Game:
         self.total_pieces = 0  # Track total pieces placed
         self.game_end_time = None  # Track game end time
         self.ai_score_tracker = AIScore()
+        self.ai_results = None  # Results screen values, worked out once when the AI game ends
+        self.frame_timer = FrameTimer()  # main.py times the frame phases, update and draw time the rest
+        self.dirty_rects = DirtyRects()  # Areas drawn this frame, main.py pushes them to the display
+        self.last_drawn_screen = None
+        self.ghost_surfaces = {}  # (cell size, color) -> translucent block for ghost pieces
 
         self.back_to_menu_button = Button(
             rect=(SCREEN_WIDTH // 2 - 75, SCREEN_HEIGHT - 100, 150, 50),
@@ -120,20 +134,29 @@ class Game:
         self.last_movement_time = 0
 
     def start_new_game(self, game=None):
+        # A fresh seed every game unless one is fixed in constants
+        self.piece_seed = PIECE_SEED if PIECE_SEED is not None else random.randrange(2 ** 32)
+
         if self.mode == "AI":
             # Player grid and pieces on the left
             self.grid = Grid(10, 20, 'left')
-            self.piece_generator = PieceGenerator(self.grid)
+            self.piece_generator = PieceGenerator(self.grid, self.piece_seed)
             self.current_piece = None
             self.next_pieces = self.piece_generator.preview_next_pieces()
             
             # AI grid and pieces on the right
             self.ai_grid = Grid(10, 20, 'right')
-            self.ai_piece_generator = PieceGenerator(self.ai_grid)  # Separate generator for AI
+            # Separate generator for AI, dealing the same pieces as the player's when the seed is shared
+            ai_seed = self.piece_seed if AI_SHARED_PIECE_SEED else self.piece_seed + 1
+            self.ai_piece_generator = PieceGenerator(self.ai_grid, ai_seed)
             self.ai_current_piece = None
             self.ai_next_pieces = self.ai_piece_generator.preview_next_pieces()
             self.ai_score = Score()
             self.ai_held_piece = None
+            self.ai_plan = None
+            self.ai_pending_piece = None
+            if self.ai_async_planner:
+                self.ai_async_planner.cancel()
             
             # Reset statistics for new game
             self.keys_per_piece = []
@@ -144,7 +167,7 @@ class Game:
         else:
             # Single centered grid for other modes
             self.grid = Grid(10, 20, 'center')
-            self.piece_generator = PieceGenerator(self.grid)
+            self.piece_generator = PieceGenerator(self.grid, self.piece_seed)
             self.current_piece = None
             self.next_pieces = self.piece_generator.preview_next_pieces()
             # Initialize statistics for all modes
@@ -172,9 +195,19 @@ class Game:
     def return_to_menu(self, game=None):
         """Return to the main menu."""
         self.current_screen = 'menu'
+        if self.ai_async_planner:
+            self.ai_async_planner.cancel()
+        self.ai_pending_piece = None
         self.is_paused = False
         self.game_over = False
 
+    def quit(self):
+        """Stop the background AI search and close the window"""
+        if self.ai_async_planner:
+            self.ai_async_planner.shutdown()
+        pygame.quit()
+        exit()
+
     def handle_events(self):
         current_time = pygame.time.get_ticks()
         
@@ -184,14 +217,12 @@ class Game:
         elif self.current_screen == 'ai_score':
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
+                    self.quit()
                 self.back_to_menu_button.handle_event(event, self)
         elif self.current_screen == 'game':
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
+                    self.quit()
                 
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
@@ -199,6 +230,8 @@ class Game:
                     elif event.key == pygame.K_p:
                         if self.current_screen == 'game':
                             self.is_paused = not self.is_paused
+                    elif event.key == pygame.K_F3:
+                        self.frame_timer.toggle_overlay()
                     # Track key presses for statistics
                     if self.mode == "AI":
                         self.current_piece_keys += 1
@@ -296,8 +329,7 @@ class Game:
         elif self.current_screen == 'enter_name':
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
+                    self.quit()
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     self.return_to_menu()
                 name = self.input_box.handle_event(event)
@@ -307,8 +339,7 @@ class Game:
         elif self.current_screen == 'high_scores':
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
+                    self.quit()
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     self.return_to_menu()
                 for button in self.high_score_buttons:
@@ -326,20 +357,19 @@ class Game:
             self.countdown_timer -= 1/60
             if self.countdown_timer <= 0:
                 self.current_screen = 'game'
-                self.current_piece = self.piece_generator.get_next_piece()
-                self.next_pieces = self.piece_generator.preview_next_pieces()
+                self.current_piece = self.next_player_piece()
                 self.can_hold = True
                 if self.mode == "AI":
                     self.ai_game_started = True
                     self.game_start_time = pygame.time.get_ticks() / 1000  # Initialize game start time
         elif self.current_screen == 'game':
-            self.particle_system.update(1/60)
+            with self.frame_timer.phase('particles_update'):
+                self.particle_system.update(1/60)
             if self.start_timer is not None:
                 self.start_timer -= 1/60
                 if self.start_timer <= 0:
                     self.start_timer = None
-                    self.current_piece = self.piece_generator.get_next_piece()
-                    self.next_pieces = self.piece_generator.preview_next_pieces()
+                    self.current_piece = self.next_player_piece()
                     self.can_hold = True
                 return
 
@@ -371,44 +401,41 @@ class Game:
                     current_time = pygame.time.get_ticks()
                     
                     if self.ai_current_piece is None:
-                        self.ai_current_piece = self.ai_piece_generator.get_next_piece()
-                        self.ai_current_piece.grid = self.ai_grid
-                        self.ai_next_pieces = self.ai_piece_generator.preview_next_pieces()
+                        self.ai_current_piece = self.next_ai_piece()
                         self.ai_move_timer = current_time  # Reset timer for new piece
                     
+                    # Search once per piece, then replay the plan one step per tick
+                    if self.ai_plan is None or self.ai_plan_piece is not self.ai_current_piece:
+                        with self.frame_timer.phase('ai'):
+                            self.plan_ai_moves()
+
                     # Only execute AI moves after delay
                     if current_time - self.ai_move_timer >= self.ai_move_delay:
                         self.ai_move_timer = current_time  # Reset timer
                         
-                        # Get and execute AI moves
-                        best_move = self.ai.get_best_move(self.ai_grid, self.ai_current_piece)
-                        if best_move:
+                        has_plan = self.ai_plan and self.ai_plan_piece is self.ai_current_piece
+                        action = self.ai_plan.pop(0) if has_plan else None
+                        if action:
                             # Handle piece holding for AI
-                            if best_move['requires_hold']:
-                                if self.ai_held_piece is None:
-                                    self.ai_held_piece = Tetromino(self.ai_current_piece.shape_name, self.ai_grid)
-                                    self.ai_current_piece = self.ai_piece_generator.get_next_piece()
-                                    self.ai_next_pieces = self.ai_piece_generator.preview_next_pieces()
-                                else:
-                                    temp_shape_name = self.ai_current_piece.shape_name
-                                    self.ai_current_piece = Tetromino(self.ai_held_piece.shape_name, self.ai_grid)
-                                    self.ai_current_piece.reset_position()
-                                    self.ai_held_piece = Tetromino(temp_shape_name, self.ai_grid)
+                            if action == 'hold':
+                                self.ai_current_piece, self.ai_held_piece = swap_hold(
+                                    self.ai_current_piece, self.ai_held_piece, self.next_ai_piece)
+                                self.ai_plan = None  # New piece, new plan
                                 return
 
                             # Execute one move at a time
                             moved = False
-                            if self.ai_current_piece.rotation_state != best_move['rotation']:
+                            if action == 'rotate':
                                 # Rotate once
                                 moved = self.ai_current_piece.rotate()
                                 if moved:
                                     self.ai_current_piece.update_position()  # Update visual position
-                            elif self.ai_current_piece.x < best_move['x']:
+                            elif action == 'right':
                                 # Move right once
                                 moved = self.ai_current_piece.move(1, 0)
                                 if moved:
                                     self.ai_current_piece.update_position()  # Update visual position
-                            elif self.ai_current_piece.x > best_move['x']:
+                            elif action == 'left':
                                 # Move left once
                                 moved = self.ai_current_piece.move(-1, 0)
                                 if moved:
@@ -419,71 +446,28 @@ class Game:
                                 # Update visual position before locking
                                 self.ai_current_piece.target_y = self.ai_current_piece.y * self.ai_grid.cell_size + self.ai_grid.y_offset
                                 self.ai_current_piece.update_position()
-                                self.ai_grid.lock_piece(self.ai_current_piece)
-                                
-                                # Add hard drop score before line clearing
-                                turn_score, notifications = self.ai_score.update(
-                                    0,  # no lines cleared yet
-                                    False,  # no T-spin
-                                    False,  # no back-to-back
-                                    drop_distance,
-                                    0,  # no soft drop
-                                    drop_distance * 2  # hard drop bonus
+
+                                # Scored as the AI always has been, so results stay comparable with the leaderboard
+                                lines_cleared, notifications = ai_lock_and_score(
+                                    self.ai_grid, self.ai_current_piece, self.ai_score, drop_distance,
+                                    on_clear=lambda lines: self.create_line_clear_particles(lines, self.ai_grid),
                                 )
-                                
-                                # Handle line clearing and scoring
-                                lines_to_clear = []
-                                for y in range(self.ai_grid.height - 1, -1, -1):
-                                    if all(self.ai_grid.cells[y][x] != 0 for x in range(self.ai_grid.width)):
-                                        lines_to_clear.append(y)
-                                
-                                lines_cleared = len(lines_to_clear)
-                                if lines_cleared > 0:
-                                    # Create particles before clearing the lines
-                                    for y in lines_to_clear:
-                                        for x in range(self.ai_grid.width):
-                                            if self.ai_grid.cells[y][x] != 0:
-                                                particle_x = self.ai_grid.x_offset + x * self.ai_grid.cell_size + self.ai_grid.cell_size // 2
-                                                particle_y = self.ai_grid.y_offset + y * self.ai_grid.cell_size + self.ai_grid.cell_size // 2
-                                                color = self.ai_grid.cells[y][x]
-                                                for _ in range(5):
-                                                    self.particle_system.add_particle(particle_x, particle_y, color)
-                                    
-                                    # Clear the lines
-                                    self.ai_grid.clear_lines()
-                                    
-                                    # Update AI score and get notifications
-                                    turn_score, notifications = self.ai_score.update(
-                                        lines_cleared,
-                                        False,  # No T-spin for AI
-                                        False,  # No back-to-back for AI
-                                        drop_distance,
-                                        0,  # No soft drop for AI
-                                        drop_distance * 2  # Hard drop bonus
-                                    )
-                                    
-                                    # Add notifications to HUD
-                                    if notifications:
-                                        self.hud.add_notifications(notifications, is_ai=True)
-                                    
-                                    # Check for level up
-                                    self.ai_score.update_level()
-                                    
-                                    # Check for board clear bonus
-                                    if self.ai_grid.is_board_clear():
-                                        tetris_clear_bonus = self.ai_score.add_tetris_clear_bonus()
-                                
+                                if notifications:
+                                    self.hud.add_notifications(notifications, is_ai=True)
+
                                 # Get next piece
-                                self.ai_current_piece = self.ai_piece_generator.get_next_piece()
-                                self.ai_current_piece.grid = self.ai_grid
-                                self.ai_next_pieces = self.ai_piece_generator.preview_next_pieces()
+                                self.ai_current_piece = self.next_ai_piece()
+                                self.ai_plan = None  # The board changed, so the plan is stale
+
+                            if action != 'drop' and not moved:
+                                # The step was blocked, search again next tick
+                                self.ai_plan = None
 
                 was_rotation = self.last_move_was_rotation
 
                 if self.drop_timer > self.drop_speed:
                     self.current_piece.move(0, 1)
                     self.drop_timer = 0
-                    self.drop_height += 1
 
                 # Handle lock delay
                 if self.current_piece.lock_delay_active:
@@ -503,50 +487,25 @@ class Game:
                     # Use the stored rotation state for T-spin detection
                     t_spin_type = self.check_t_spin() if was_rotation else False
 
-                    # Lock the piece
-                    self.grid.lock_piece(self.current_piece)
-                    
-                    # Clear lines and handle scoring
-                    lines_to_clear = []
-                    for y in range(self.grid.height - 1, -1, -1):
-                        if all(self.grid.cells[y][x] != 0 for x in range(self.grid.width)):
-                            lines_to_clear.append(y)
-                    
-                    lines_cleared = len(lines_to_clear)
-                    if lines_cleared > 0:
-                        # Handle line clear
-                        self.create_line_clear_particles(lines_to_clear)
-                        self.grid.clear_lines()
-                    
-                    # Calculate score 
-                    turn_score, notifications = self.score.update(
-                        lines_cleared,
-                        t_spin_type,
-                        False,
-                        self.drop_height,
-                        self.soft_drop_count,
-                        self.hard_drop_count
+                    # Lock, clear lines and score, with particles for the cleared rows
+                    lines_cleared, notifications = lock_and_score(
+                        self.grid, self.current_piece, self.score, t_spin_type,
+                        self.soft_drop_count, self.hard_drop_count, self.create_line_clear_particles,
                     )
-                    
+
                     # Add notifications to HUD
                     if notifications:
                         self.hud.add_notifications(notifications, is_ai=False)
                     
-                    self.drop_height = 0
                     self.soft_drop_count = 0
                     self.hard_drop_count = 0
                     self.last_rotation = False
                     self.last_move_was_rotation = False
 
                     if lines_cleared > 0:
-                        self.score.update_level()
                         self.update_drop_speed()
 
-                    if self.grid.is_board_clear():
-                        tetris_clear_bonus = self.score.add_tetris_clear_bonus()
-
-                    self.current_piece = self.piece_generator.get_next_piece()
-                    self.next_pieces = self.piece_generator.preview_next_pieces()
+                    self.current_piece = self.next_player_piece()
                     self.can_hold = True  # Reset hold ability for new piece
 
                     if self.mode == "AI":
@@ -574,6 +533,7 @@ class Game:
 
             if stats:
                 self.ai_score_tracker.add_score(stats)
+            self.ai_results = self.calculate_ai_results()
             self.current_screen = 'ai_score'
             self.game_over = False  # Reset game over state
         elif self.mode == "Classic Mode":
@@ -598,6 +558,12 @@ class Game:
         )
 
     def draw(self):
+        # Only normal play reports what it drew, everything else redraws the whole display
+        if (self.current_screen != 'game' or self.current_screen != self.last_drawn_screen or self.is_paused
+                or self.game_over or self.transition.is_active):
+            self.dirty_rects.request_full_update()
+        self.last_drawn_screen = self.current_screen
+
         if self.current_screen == 'menu':
             self.menu.draw(self.screen)
         elif self.current_screen == 'transition_to_game':
@@ -606,36 +572,33 @@ class Game:
             # Draw AI grid in AI mode during transition
             if self.mode == "AI":
                 self.ai_grid.draw(self.screen)
-            self.hud.draw(self.screen)
-            self.particle_system.draw(self.screen)
+            self.draw_hud_and_particles()
         elif self.current_screen == 'countdown':
             self.screen.fill(COLORS['background'])
             self.grid.draw(self.screen)
             # Draw AI grid in AI mode during countdown
             if self.mode == "AI":
                 self.ai_grid.draw(self.screen)
-            self.hud.draw(self.screen)
-            self.particle_system.draw(self.screen)
+            self.draw_hud_and_particles()
             self.draw_countdown()
         elif self.current_screen == 'game':
             self.screen.fill(COLORS['background'])
             
             # Draw main grid
-            self.grid.draw(self.screen)
+            self.dirty_rects.add(self.grid.draw(self.screen))
             
             # Draw AI grid in AI mode
             if self.mode == "AI":
-                self.ai_grid.draw(self.screen)
+                self.dirty_rects.add(self.ai_grid.draw(self.screen))
                 if self.ai_current_piece:
-                    self.draw_ghost_piece(self.ai_current_piece, is_ai=True)  # Draw AI ghost piece
-                    self.ai_current_piece.draw(self.screen)
+                    self.dirty_rects.add(self.draw_ghost_piece(self.ai_current_piece, is_ai=True))  # Draw AI ghost piece
+                    self.dirty_rects.add(self.ai_current_piece.draw(self.screen))
             
             if not self.game_over and self.current_piece:
-                self.draw_ghost_piece()  # Draw player ghost piece
-                self.current_piece.draw(self.screen)
+                self.dirty_rects.add(self.draw_ghost_piece())  # Draw player ghost piece
+                self.dirty_rects.add(self.current_piece.draw(self.screen))
             
-            self.hud.draw(self.screen)
-            self.particle_system.draw(self.screen)
+            self.draw_hud_and_particles()
             if self.is_paused:
                 self.draw_pause_overlay()
                 self.back_button.draw(self.screen)
@@ -649,28 +612,22 @@ class Game:
             self.draw_high_scores()
         elif self.current_screen == 'ai_score':
             self.screen.fill(COLORS['background'])
-            font = pygame.font.Font(FONT_NAME, 48)
-            text = font.render("AI Game Results", True, COLORS['white'])
+            text = render_text("AI Game Results", 48, COLORS['white'])
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, 100))
             self.screen.blit(text, text_rect)
 
             # Display scores and difference
-            font_small = pygame.font.Font(FONT_NAME, 36)
-            score_diff = self.score.score - self.ai_score.score
-            color = COLORS['green'] if score_diff >= 0 else COLORS['red']
-            
-            player_text = font_small.render(f"Your Score: {self.score.score}", True, COLORS['white'])
-            ai_text = font_small.render(f"AI Score: {self.ai_score.score}", True, COLORS['white'])
-            diff_text = font_small.render(f"Score Difference: {abs(score_diff)}", True, color)
-            delay_text = font_small.render(f"AI Move Delay: {self.ai_move_delay}ms", True, COLORS['white'])
-            kpp_text = font_small.render(f"Keys Per Piece: {round(sum(self.keys_per_piece) / len(self.keys_per_piece) if self.keys_per_piece else 0, 2)}", True, COLORS['white'])
-            pps_text = font_small.render(f"Pieces Per Second: {round(self.total_pieces / (self.game_end_time - self.game_start_time), 2)}", True, COLORS['white'])
-            
-            # Get placement from ai_scores.json
-            from ai_score import AIScore
-            ai_score_handler = AIScore()
-            placement = ai_score_handler.get_placement(score_diff, self.ai_move_delay)
-            placement_text = font_small.render(f"Your Placement: {placement}", True, COLORS['white'])
+            results = self.ai_results
+            color = COLORS['green'] if results['score_difference'] >= 0 else COLORS['red']
+
+            player_text = render_text(f"Your Score: {self.score.score}", 36, COLORS['white'])
+            ai_text = render_text(f"AI Score: {self.ai_score.score}", 36, COLORS['white'])
+            diff_text = render_text(f"Score Difference: {abs(results['score_difference'])}", 36, color)
+            delay_text = render_text(f"AI Move Delay: {self.ai_move_delay}ms", 36, COLORS['white'])
+            kpp_text = render_text(f"Keys Per Piece: {results['keys_per_piece']}", 36, COLORS['white'])
+            pps_text = render_text(f"Pieces Per Second: {results['pieces_per_second']}", 36, COLORS['white'])
+            placement_text = render_text(f"Your Placement: {results['placement']} of {results['total_games']} "
+                                         f"(beat or matched {results['percentile']}%)", 36, COLORS['white'])
 
             # Position all text elements
             player_rect = player_text.get_rect(center=(SCREEN_WIDTH // 2, 180))
@@ -695,37 +652,75 @@ class Game:
 
         self.transition.draw(self.screen)
 
+    def draw_hud_and_particles(self):
+        with self.frame_timer.phase('hud'):
+            self.dirty_rects.add(self.hud.draw(self.screen))
+        with self.frame_timer.phase('particles_draw'):
+            self.dirty_rects.add(self.particle_system.draw(self.screen))
+
+    def plan_ai_moves(self):
+        """Get a plan for the current AI piece, searching in the background when async planning is on"""
+        # A one-piece search is quick, and get_best_move is the path with the greedy move choice
+        if self.ai_async_planner is None or self.ai.planner.depth <= 1:
+            self.build_ai_plan(self.ai.get_best_move(self.ai_grid, self.ai_current_piece, self.ai_held_piece,
+                                                     self.ai_next_pieces, self.can_hold))
+            return
+
+        if self.ai_pending_piece is not self.ai_current_piece:
+            # Hand the worker a snapshot and keep rendering while it searches
+            snapshot = self.ai.get_search_snapshot(self.ai_grid, self.ai_current_piece, self.ai_held_piece,
+                                                   self.ai_next_pieces, self.can_hold)
+            self.ai_async_planner.submit(snapshot)
+            self.ai_pending_piece = self.ai_current_piece
+
+        finished, best_move = self.ai_async_planner.poll()
+        if finished:
+            self.ai_pending_piece = None
+            self.build_ai_plan(self.ai.apply_hold_threshold(best_move, self.ai_current_piece, self.can_hold))
+
+    def build_ai_plan(self, best_move):
+        """Turn the AI's chosen move into single steps for the current AI piece"""
+        self.ai_plan_piece = self.ai_current_piece
+        self.ai_plan = move_steps(self.ai_current_piece, best_move) if best_move else []
+
     def draw_ghost_piece(self, piece=None, is_ai=False):
-        """Draw ghost piece for either player or AI"""
+        """Draw ghost piece for either player or AI, returning the area it covers"""
         piece = piece or self.current_piece
         if not piece:
-            return
+            return None
         
         # Get ghost piece 
-        ghost_piece = piece.get_ghost_position()
-        
+        ghost_x, ghost_y = piece.get_ghost_position()
+
+        # One transparent surface per cell size and color, shared by every block and every frame
+        ghost_key = (piece.grid.cell_size, piece.color)
+        ghost_surface = self.ghost_surfaces.get(ghost_key)
+        if ghost_surface is None:
+            ghost_surface = pygame.Surface((piece.grid.cell_size, piece.grid.cell_size), pygame.SRCALPHA)
+            r, g, b = piece.color
+            ghost_surface.fill((r, g, b, GHOST_ALPHA))
+            self.ghost_surfaces[ghost_key] = ghost_surface
+
         # Draw ghost piece with transparency
-        for x, y in ghost_piece.get_block_positions():
+        drawn = None
+        for x, y in piece.table.cells:
             rect = pygame.Rect(
-                piece.grid.x_offset + x * piece.grid.cell_size,
-                piece.grid.y_offset + y * piece.grid.cell_size,
+                piece.grid.x_offset + (ghost_x + x) * piece.grid.cell_size,
+                piece.grid.y_offset + (ghost_y + y) * piece.grid.cell_size,
                 piece.grid.cell_size,
                 piece.grid.cell_size,
             )
-            # Create a transparent surface for the ghost piece
-            ghost_surface = pygame.Surface((piece.grid.cell_size, piece.grid.cell_size), pygame.SRCALPHA)
-            r, g, b = piece.color
-            ghost_surface.fill((r, g, b, GHOST_ALPHA))
             self.screen.blit(ghost_surface, rect)
             pygame.draw.rect(self.screen, COLORS['white'], rect, 1)
+            drawn = rect if drawn is None else drawn.union(rect)
+        return drawn
 
     def draw_pause_overlay(self):
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         overlay.set_alpha(128)
         overlay.fill((0, 0, 0))
         self.screen.blit(overlay, (0, 0))
-        font = pygame.font.Font(FONT_NAME, 72)
-        text = font.render("Paused", True, COLORS['white'])
+        text = render_text("Paused", 72, COLORS['white'])
         rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.screen.blit(text, rect)
 
@@ -741,14 +736,12 @@ class Game:
         overlay.fill((0, 0, 0))
         self.screen.blit(overlay, (0, 0))
         
-        font = pygame.font.Font(FONT_NAME, 72)
-        text = font.render("Game Over", True, COLORS['white'])
+        text = render_text("Game Over", 72, COLORS['white'])
         rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
         self.screen.blit(text, rect)
 
         # Draw score
-        score_font = pygame.font.Font(FONT_NAME, 48)
-        score_text = score_font.render(f"Score: {self.score.score}", True, COLORS['white'])
+        score_text = render_text(f"Score: {self.score.score}", 48, COLORS['white'])
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.screen.blit(score_text, score_rect)
 
@@ -758,8 +751,7 @@ class Game:
 
     def draw_enter_name(self):
         self.screen.fill(COLORS['background'])
-        font = pygame.font.Font(FONT_NAME, 48)
-        prompt = font.render("New High Score! Enter your name:", True, COLORS['white'])
+        prompt = render_text("New High Score! Enter your name:", 48, COLORS['white'])
         prompt_rect = prompt.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
         self.screen.blit(prompt, prompt_rect)
 
@@ -768,15 +760,13 @@ class Game:
 
     def draw_high_scores(self):
         self.screen.fill(COLORS['background'])
-        font = pygame.font.Font(FONT_NAME, 48)
-        title = font.render("High Scores", True, COLORS['white'])
+        title = render_text("High Scores", 48, COLORS['white'])
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 100))
         self.screen.blit(title, title_rect)
 
         # Display high scores
-        font_small = pygame.font.Font(FONT_NAME, 36)
         for idx, entry in enumerate(self.high_score.scores):
-            score_text = font_small.render(f"{idx + 1}. {entry['name']} - {entry['score']}", True, COLORS['white'])
+            score_text = render_text(f"{idx + 1}. {entry['name']} - {entry['score']}", 36, COLORS['white'])
             score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, 200 + idx * 50))
             self.screen.blit(score_text, score_rect)
 
@@ -851,18 +841,19 @@ class Game:
         else:  # T pointing left (3)
             return [(piece.x + 2, piece.y), (piece.x + 2, piece.y + 2)]  # Right corners
 
-    def create_line_clear_particles(self, lines_to_clear):
-        """Create particles for each block in the cleared lines"""
+    def create_line_clear_particles(self, lines_to_clear, grid=None):
+        """Create particles for each block in the cleared lines, one burst per line"""
+        if grid is None:
+            grid = self.grid
         for y in lines_to_clear:
-            for x in range(self.grid.width):
-                if self.grid.cells[y][x] != 0:  # If there's a block at this position
-                    # Calculate the pixel position
-                    particle_x = self.grid.x_offset + x * self.grid.cell_size + self.grid.cell_size // 2
-                    particle_y = self.grid.y_offset + y * self.grid.cell_size + self.grid.cell_size // 2
-                    color = self.grid.cells[y][x]  # Get the color of the block
-                    
-                    for _ in range(5):  # Create 5 particles per block
-                        self.particle_system.add_particle(particle_x, particle_y, color)
+            blocks = [x for x in range(grid.width) if grid.cells[y][x] != 0]
+            if not blocks:
+                continue
+            # Pixel centres of the blocks
+            xs = [grid.x_offset + x * grid.cell_size + grid.cell_size // 2 for x in blocks]
+            ys = [grid.y_offset + y * grid.cell_size + grid.cell_size // 2] * len(blocks)
+            colors = [grid.cells[y][x] for x in blocks]
+            self.particle_system.add_burst(xs, ys, colors, PARTICLES_PER_BLOCK)
 
     def change_screen(self, new_screen):
         self.transition.start()
@@ -880,36 +871,33 @@ class Game:
         overlay.fill((255, 255, 255, alpha))
         self.screen.blit(overlay, (0, 0))
         
-        font = pygame.font.Font(None, 72)
-        text = font.render(f"Level {self.score.level}", True, COLORS['white'])
+        text = render_text(f"Level {self.score.level}", 72, COLORS['white'])
         text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.screen.blit(text, text_rect)
 
     def draw_start_timer(self):
-        font = pygame.font.Font(FONT_NAME, 72)
-        text = font.render(str(max(1, int(self.start_timer + 1))), True, COLORS['white'])
+        text = render_text(str(max(1, int(self.start_timer + 1))), 72, COLORS['white'])
         rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.screen.blit(text, rect)
 
     def draw_countdown(self):
-        font = pygame.font.Font(FONT_NAME, 72)
-        text = font.render(str(max(1, int(self.countdown_timer + 1))), True, COLORS['white'])
+        text = render_text(str(max(1, int(self.countdown_timer + 1))), 72, COLORS['white'])
         rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         self.screen.blit(text, rect)
 
     def hold_piece(self):
         """Handle the piece hold mechanic"""
-        if self.held_piece is None:
-            # First hold
-            self.held_piece = Tetromino(self.current_piece.shape_name, self.grid)
-            self.current_piece = self.piece_generator.get_next_piece()
-            self.next_pieces = self.piece_generator.preview_next_pieces()
-        else:
-            # Swap current and held pieces
-            temp_shape_name = self.current_piece.shape_name
-            self.current_piece = Tetromino(self.held_piece.shape_name, self.grid)
-            self.current_piece.reset_position()  # Reset position of the swapped piece
-            self.held_piece = Tetromino(temp_shape_name, self.grid)
+        self.current_piece, self.held_piece = swap_hold(self.current_piece, self.held_piece, self.next_player_piece)
+
+    def next_player_piece(self):
+        piece = self.piece_generator.get_next_piece()
+        self.next_pieces = self.piece_generator.preview_next_pieces()
+        return piece
+
+    def next_ai_piece(self):
+        piece = self.ai_piece_generator.get_next_piece()
+        self.ai_next_pieces = self.ai_piece_generator.preview_next_pieces()
+        return piece
 
     def on_piece_placed(self):
         # Track total pieces for all modes
@@ -938,3 +926,16 @@ class Game:
             "total_pieces": self.total_pieces,
             "game_duration": round(game_duration, 2)
         }
+
+    def calculate_ai_results(self):
+        """Everything the AI results screen shows, so drawing it never touches the leaderboard"""
+        score_diff = self.score.score - self.ai_score.score
+        duration = self.game_end_time - self.game_start_time if self.game_start_time else 0
+        return {
+            'score_difference': score_diff,
+            'keys_per_piece': round(sum(self.keys_per_piece) / len(self.keys_per_piece) if self.keys_per_piece else 0, 2),
+            'pieces_per_second': round(self.total_pieces / duration, 2) if duration > 0 else 0,
+            'placement': self.ai_score_tracker.get_placement(score_diff, self.ai_move_delay),
+            'total_games': self.ai_score_tracker.get_total_games(self.ai_move_delay),
+            'percentile': round(self.ai_score_tracker.get_percentile(score_diff, self.ai_move_delay)),
+        }
@@ -2,17 +2,11 @@
 
 import pygame
 from constants import CELL_SIZE, GRID_X_OFFSET, GRID_Y_OFFSET, COLORS, SCREEN_WIDTH
+from engine import Board
 
-class Grid:
+class Grid(Board):
     def __init__(self, width, height, position='center'):
-
-        #####################################
-        # GROUP A SKILL : Complex Structure #
-        #####################################
-
-        self.width = width
-        self.height = height
-        self.cells = [[0 for _ in range(width)] for _ in range(height)]
+        super().__init__(width, height)
         self.cell_size = CELL_SIZE
         # Adjust x_offset based on position
         if position == 'left':
@@ -22,53 +16,58 @@ class Grid:
         else:  # center
             self.x_offset = (SCREEN_WIDTH - (width * CELL_SIZE)) // 2
         self.y_offset = GRID_Y_OFFSET
-        self.lines_to_clear = []
 
-    def is_collision(self, piece):
-        for x, y in piece.get_block_positions():
-            if x < 0 or x >= self.width or y >= self.height:
-                return True
-            if y >= 0 and self.cells[y][x]:
-                return True
-        return False
+        # The locked board is kept pre-rendered, only rows that changed are drawn again
+        self.surface = None
+        self.dirty_rows = set()
+        self.dirty_through = -1  # Every row from the top down to this one needs drawing too
 
-    def lock_piece(self, piece):
-        for x, y in piece.get_block_positions():
-            if y >= 0:
-                self.cells[y][x] = piece.color
+    def cell_value(self, piece):
+        # Cells hold the piece color so they can be drawn directly
+        return piece.color
+
+    def load_cells(self, cells):
+        super().load_cells(cells)
+        self.surface = None  # Everything changed, render from scratch
 
-    def clear_lines(self):
-        self.lines_to_clear = []
-        for y in range(self.height - 1, -1, -1):
-            if all(self.cells[y][x] != 0 for x in range(self.width)):
-                self.lines_to_clear.append(y)
-        
-        if self.lines_to_clear:
-            self.remove_lines()
-        
-        return len(self.lines_to_clear)
+    def lock_piece(self, piece):
+        super().lock_piece(piece)
+        self.dirty_rows.update(y for _, y in piece.get_block_positions() if y >= 0)
 
     def remove_lines(self):
-        new_cells = [[0 for _ in range(self.width)] for _ in range(len(self.lines_to_clear))]
-        old_cells = [row for i, row in enumerate(self.cells) if i not in self.lines_to_clear]
-        self.cells = new_cells + old_cells
-        self.lines_to_clear = []
+        # Every row from the lowest cleared line up shifts down
+        self.dirty_through = max(self.dirty_through, max(self.lines_to_clear))
+        super().remove_lines()
 
-    def draw(self, screen):
-        for y in range(self.height):
+    def render(self):
+        """Bring the cached board surface up to date, returning the area that changed"""
+        if self.surface is None:
+            self.surface = pygame.Surface((self.width * self.cell_size, self.height * self.cell_size))
+            self.dirty_through = self.height - 1
+        rows = self.dirty_rows.union(range(self.dirty_through + 1))
+        if not rows:
+            return None
+
+        changed = None
+        for y in rows:
             for x in range(self.width):
-                rect = pygame.Rect(
-                    self.x_offset + x * self.cell_size,
-                    self.y_offset + y * self.cell_size,
-                    self.cell_size,
-                    self.cell_size,
-                )
+                rect = pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
                 if self.cells[y][x]:
-                    pygame.draw.rect(screen, self.cells[y][x], rect)
-                    pygame.draw.rect(screen, COLORS['white'], rect, 1)
+                    pygame.draw.rect(self.surface, self.cells[y][x], rect)
+                    pygame.draw.rect(self.surface, COLORS['white'], rect, 1)
                 else:
-                    pygame.draw.rect(screen, COLORS['grid_line'], rect, 1)
+                    self.surface.fill(COLORS['background'], rect)
+                    pygame.draw.rect(self.surface, COLORS['grid_line'], rect, 1)
+            row_rect = pygame.Rect(0, y * self.cell_size, self.width * self.cell_size, self.cell_size)
+            changed = row_rect if changed is None else changed.union(row_rect)
+        self.dirty_rows.clear()
+        self.dirty_through = -1
+        return changed
 
-    def is_board_clear(self):
-        """Check if the entire board is clear"""
-        return all(cell == 0 for row in self.cells for cell in row)
+    def draw(self, screen):
+        """Blit the board, returning the screen area whose cells changed since the last draw"""
+        changed = self.render()
+        screen.blit(self.surface, (self.x_offset, self.y_offset))
+        if changed is None:
+            return None
+        return changed.move(self.x_offset, self.y_offset)
@@ -2,17 +2,36 @@
 
 import json
 import os
-from constants import HIGH_SCORE_FILE, MAX_HIGH_SCORES, HIGH_SCORE_ENCRYPTION_KEY
+from functools import partial
+from pathlib import Path
+from constants import (HIGH_SCORE_FILE, MAX_HIGH_SCORES, HIGH_SCORE_ENCRYPTION_KEY, SCORE_BACKEND,
+                       SCORE_DATABASE_FILE, SCORE_DATABASE_ENCRYPT_NAMES)
 from encrypt import Encrypt
+from score_writer import SCORE_WRITER, atomic_write
 
 class HighScore:
-    def __init__(self):
-        self.scores = []
+    def __init__(self, backend=SCORE_BACKEND, store=None):
+        self.scores = []  # The top MAX_HIGH_SCORES, best first
         # Initialize the Encrypt instance using the fixed encryption key.
         self.encryptor = Encrypt(HIGH_SCORE_ENCRYPTION_KEY)
+        # With the sqlite backend every score is kept in the database, not just the top few
+        self.store = store
+        if self.store is None and backend == 'sqlite':
+            from score_store import SQLiteScoreStore
+            self.store = SQLiteScoreStore(Path(__file__).parent / SCORE_DATABASE_FILE,
+                                          self.encryptor if SCORE_DATABASE_ENCRYPT_NAMES else None)
         self.load_scores()
 
     def load_scores(self):
+        if self.store is not None:
+            if self.store.high_score_count() == 0:
+                self.load_file_scores()  # Carry the scores from the file over into a new database
+                self.store.add_high_scores(self.scores)
+            self.scores = self.store.top_high_scores(MAX_HIGH_SCORES)
+        else:
+            self.load_file_scores()
+
+    def load_file_scores(self):
         """Load high scores from an encrypted JSON file."""
         if os.path.exists(HIGH_SCORE_FILE):
             with open(HIGH_SCORE_FILE, 'r') as file:
@@ -41,8 +60,18 @@ class HighScore:
             return True
         return any(score > entry['score'] for entry in self.scores)
 
+    def get_rank(self, score):
+        """Place the score would take, among every game with the sqlite backend"""
+        if self.store is not None:
+            return self.store.high_score_rank(score)
+        return sum(1 for entry in self.scores if entry['score'] > score) + 1
+
     def add_score(self, name, score):
         """Add a new score to the high score list."""
+        if self.store is not None:
+            self.store.add_high_score(name, score)
+            self.scores = self.store.top_high_scores(MAX_HIGH_SCORES)
+            return
         self.scores.append({'name': name, 'score': score})
         # Sort scores in descending order
         self.scores = sorted(self.scores, key=lambda x: x['score'], reverse=True)
@@ -51,9 +80,14 @@ class HighScore:
         self.save_scores()
     
     def save_scores(self):
-        """Save high scores to an encrypted JSON file."""
+        """Save high scores to an encrypted JSON file, on the score writer thread."""
+        # Later saves replace one still waiting, only the newest list needs writing
+        scores = [dict(entry) for entry in self.scores]
+        SCORE_WRITER.submit(partial(self.write_scores, scores), key=HIGH_SCORE_FILE)
+
+    def write_scores(self, scores):
         # Convert the scores to a JSON-formatted string.
-        json_data = json.dumps(self.scores, indent=4)
+        json_data = json.dumps(scores, indent=4)
         # Encrypt the JSON string.
 
         #############################
@@ -61,5 +95,4 @@ class HighScore:
         #############################
 
         encrypted_data = self.encryptor.encrypt_text(json_data)
-        with open(HIGH_SCORE_FILE, 'w') as file:
-            file.write(encrypted_data)
\ No newline at end of file
+        atomic_write(HIGH_SCORE_FILE, encrypted_data)
\ No newline at end of file
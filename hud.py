@@ -1,13 +1,12 @@
 # hud.py
 
 import pygame
-from constants import FONT_NAME, FONT_SIZE, COLORS, CELL_SIZE, GRID_Y_OFFSET, SCREEN_WIDTH, HOLD_X_OFFSET, HOLD_Y_OFFSET
+from constants import FONT_SIZE, COLORS, CELL_SIZE, GRID_Y_OFFSET, SCREEN_WIDTH, HOLD_X_OFFSET, HOLD_Y_OFFSET
+from text_cache import render_text
 
 class HUD:
     def __init__(self, game):
         self.game = game
-        self.font = pygame.font.Font(FONT_NAME, FONT_SIZE)
-        self.small_font = pygame.font.Font(FONT_NAME, FONT_SIZE - 8)
         self.player_notifications = []  # List of active player notifications
         self.ai_notifications = []  # List of active AI notifications
         self.notifications = []  # For classic mode
@@ -54,113 +53,122 @@ class HUD:
                     self.notifications.remove(notif)
 
     def draw(self, screen):
+        """Draw the HUD, returning the rects of everything drawn"""
         if self.game.mode == "AI":
             # Draw player HUD on the left
-            self.draw_player_hud(screen)
+            rects = self.draw_player_hud(screen)
             # Draw AI HUD on the right
-            self.draw_ai_hud(screen)
+            rects += self.draw_ai_hud(screen)
             # Draw score difference in the middle top
-            self.draw_score_difference(screen)
+            rects += self.draw_score_difference(screen)
+            return rects
         else:
             # Draw centered HUD for non-AI modes
-            self.draw_centered_hud(screen)
+            return self.draw_centered_hud(screen)
 
     def draw_player_hud(self, screen):
+        rects = []
         # Calculate positions
         player_grid_right = self.game.grid.x_offset + (self.game.grid.width * self.game.grid.cell_size)
         hud_x = player_grid_right + 50  # Add some padding
         hold_x = self.game.grid.x_offset - 150  # Position hold piece to the left of grid
 
         # Player score and level on the right of player grid
-        score_text = self.font.render(f"Score: {self.game.score.score}", True, COLORS['white'])
-        level_text = self.font.render(f"Level: {self.game.score.level}", True, COLORS['white'])
+        score_text = render_text(f"Score: {self.game.score.score}", FONT_SIZE, COLORS['white'])
+        level_text = render_text(f"Level: {self.game.score.level}", FONT_SIZE, COLORS['white'])
         
-        screen.blit(score_text, (hud_x, GRID_Y_OFFSET))
-        screen.blit(level_text, (hud_x, GRID_Y_OFFSET + 50))
+        rects.append(screen.blit(score_text, (hud_x, GRID_Y_OFFSET)))
+        rects.append(screen.blit(level_text, (hud_x, GRID_Y_OFFSET + 50)))
 
         # Next pieces text and preview for player
-        next_text = self.font.render("Next:", True, COLORS['white'])
-        screen.blit(next_text, (hud_x, GRID_Y_OFFSET + 100))
+        next_text = render_text("Next:", FONT_SIZE, COLORS['white'])
+        rects.append(screen.blit(next_text, (hud_x, GRID_Y_OFFSET + 100)))
         
         # Draw player's next pieces
         if self.game.next_pieces:
-            self.draw_next_pieces(screen, self.game.next_pieces, hud_x)
+            rects += self.draw_next_pieces(screen, self.game.next_pieces, hud_x)
 
         # Draw player's hold piece on the left
-        hold_text = self.font.render("Hold:", True, COLORS['white'])
-        screen.blit(hold_text, (hold_x, HOLD_Y_OFFSET))
+        hold_text = render_text("Hold:", FONT_SIZE, COLORS['white'])
+        rects.append(screen.blit(hold_text, (hold_x, HOLD_Y_OFFSET)))
         if self.game.held_piece:
-            self.draw_hold_piece(screen, hold_x)
+            rects += self.draw_hold_piece(screen, hold_x)
 
         # Draw player notifications under the hold piece
         for idx, notif in enumerate(self.player_notifications):
-            text_surface = self.small_font.render(notif['text'], True, notif['color'])
+            text_surface = render_text(notif['text'], FONT_SIZE - 8, notif['color'])
             text_rect = text_surface.get_rect(center=(hold_x + 60, HOLD_Y_OFFSET + 150 + idx * 30))
-            screen.blit(text_surface, text_rect)
+            rects.append(screen.blit(text_surface, text_rect))
+        return rects
 
     def draw_ai_hud(self, screen):
+        rects = []
         # Calculate positions
         ai_grid_right = self.game.ai_grid.x_offset + (self.game.ai_grid.width * self.game.ai_grid.cell_size)
         hud_x = ai_grid_right + 50  # Add some padding
         hold_x = self.game.ai_grid.x_offset - 150  # Position hold piece to the left of grid
 
         # AI score and level
-        score_text = self.font.render(f"AI Score: {self.game.ai_score.score}", True, COLORS['white'])
-        level_text = self.font.render(f"AI Level: {self.game.ai_score.level}", True, COLORS['white'])
+        score_text = render_text(f"AI Score: {self.game.ai_score.score}", FONT_SIZE, COLORS['white'])
+        level_text = render_text(f"AI Level: {self.game.ai_score.level}", FONT_SIZE, COLORS['white'])
         
-        screen.blit(score_text, (hud_x, GRID_Y_OFFSET))
-        screen.blit(level_text, (hud_x, GRID_Y_OFFSET + 50))
+        rects.append(screen.blit(score_text, (hud_x, GRID_Y_OFFSET)))
+        rects.append(screen.blit(level_text, (hud_x, GRID_Y_OFFSET + 50)))
 
         # Next pieces for AI
-        next_text = self.font.render("Next:", True, COLORS['white'])
-        screen.blit(next_text, (hud_x, GRID_Y_OFFSET + 100))
+        next_text = render_text("Next:", FONT_SIZE, COLORS['white'])
+        rects.append(screen.blit(next_text, (hud_x, GRID_Y_OFFSET + 100)))
 
         # Draw AI's next pieces
         if self.game.ai_next_pieces:
-            self.draw_next_pieces(screen, self.game.ai_next_pieces, hud_x)
+            rects += self.draw_next_pieces(screen, self.game.ai_next_pieces, hud_x)
 
         # Draw AI's held piece
-        hold_text = self.font.render("Hold:", True, COLORS['white'])
-        screen.blit(hold_text, (hold_x, HOLD_Y_OFFSET))
+        hold_text = render_text("Hold:", FONT_SIZE, COLORS['white'])
+        rects.append(screen.blit(hold_text, (hold_x, HOLD_Y_OFFSET)))
         if self.game.ai_held_piece:
-            self.draw_hold_piece(screen, hold_x, is_ai=True)
+            rects += self.draw_hold_piece(screen, hold_x, is_ai=True)
 
         # Draw AI notifications under the hold piece
         for idx, notif in enumerate(self.ai_notifications):
-            text_surface = self.small_font.render(notif['text'], True, notif['color'])
+            text_surface = render_text(notif['text'], FONT_SIZE - 8, notif['color'])
             text_rect = text_surface.get_rect(center=(hold_x + 60, HOLD_Y_OFFSET + 150 + idx * 30))
-            screen.blit(text_surface, text_rect)
+            rects.append(screen.blit(text_surface, text_rect))
+        return rects
 
     def draw_centered_hud(self, screen):
+        rects = []
         # Original HUD drawing for non-AI modes
-        score_text = self.font.render(f"Score: {self.game.score.score}", True, COLORS['white'])
-        screen.blit(score_text, (1000, GRID_Y_OFFSET))
+        score_text = render_text(f"Score: {self.game.score.score}", FONT_SIZE, COLORS['white'])
+        rects.append(screen.blit(score_text, (1000, GRID_Y_OFFSET)))
         
-        level_text = self.font.render(f"Level: {self.game.score.level}", True, COLORS['white'])
-        screen.blit(level_text, (1000, GRID_Y_OFFSET + 50))
+        level_text = render_text(f"Level: {self.game.score.level}", FONT_SIZE, COLORS['white'])
+        rects.append(screen.blit(level_text, (1000, GRID_Y_OFFSET + 50)))
         
-        next_text = self.font.render("Next:", True, COLORS['white'])
-        screen.blit(next_text, (1000, GRID_Y_OFFSET + 100))
+        next_text = render_text("Next:", FONT_SIZE, COLORS['white'])
+        rects.append(screen.blit(next_text, (1000, GRID_Y_OFFSET + 100)))
 
         # Draw next pieces
-        self.draw_next_pieces(screen, self.game.next_pieces, 1000)
+        rects += self.draw_next_pieces(screen, self.game.next_pieces, 1000)
 
         # Draw hold text and piece
-        hold_text = self.font.render("Hold:", True, COLORS['white'])
-        screen.blit(hold_text, (HOLD_X_OFFSET, HOLD_Y_OFFSET))
+        hold_text = render_text("Hold:", FONT_SIZE, COLORS['white'])
+        rects.append(screen.blit(hold_text, (HOLD_X_OFFSET, HOLD_Y_OFFSET)))
 
         # Draw notifications
         for idx, notif in enumerate(self.notifications):
-            text_surface = self.small_font.render(notif['text'], True, notif['color'])
+            text_surface = render_text(notif['text'], FONT_SIZE - 8, notif['color'])
             text_rect = text_surface.get_rect(center=(HOLD_X_OFFSET + 50, HOLD_Y_OFFSET + 150 + idx * 30))
-            screen.blit(text_surface, text_rect)
+            rects.append(screen.blit(text_surface, text_rect))
 
         # Draw hold piece
-        self.draw_hold_piece(screen, HOLD_X_OFFSET)
+        rects += self.draw_hold_piece(screen, HOLD_X_OFFSET)
+        return rects
 
     def draw_next_pieces(self, screen, pieces, x_offset):
+        rects = []
         if not pieces:
-            return
+            return rects
             
         block_size = CELL_SIZE
         for piece_idx, next_piece in enumerate(pieces):
@@ -179,11 +187,14 @@ class HUD:
                         )
                         pygame.draw.rect(screen, next_piece.color, rect)
                         pygame.draw.rect(screen, COLORS['white'], rect, 1)
+                        rects.append(rect)
+        return rects
 
     def draw_hold_piece(self, screen, x_offset, is_ai=False):
         piece = self.game.ai_held_piece if is_ai else self.game.held_piece
+        rects = []
         if not piece:
-            return
+            return rects
             
         block_size = CELL_SIZE
         for y, row in enumerate(piece.shape):
@@ -197,17 +208,21 @@ class HUD:
                     )
                     pygame.draw.rect(screen, piece.color, rect)
                     pygame.draw.rect(screen, COLORS['white'], rect, 1)
+                    rects.append(rect)
+        return rects
 
     def draw_score_difference(self, screen):
+        rects = []
         if self.game.score and self.game.ai_score:
             score_diff = self.game.score.score - self.game.ai_score.score
             color = COLORS['green'] if score_diff >= 0 else COLORS['red']
-            diff_text = self.font.render(f"Score Diff: {abs(score_diff)}", True, color)
+            diff_text = render_text(f"Score Diff: {abs(score_diff)}", FONT_SIZE, color)
             diff_rect = diff_text.get_rect(center=(SCREEN_WIDTH // 2, 30))
-            screen.blit(diff_text, diff_rect)
+            rects.append(screen.blit(diff_text, diff_rect))
 
             # Draw timer if game is in progress
             if self.game.ai_game_started and not self.game.game_over:
-                timer_text = self.font.render(f"Time: {int(self.game.ai_game_timer)}s", True, COLORS['white'])
+                timer_text = render_text(f"Time: {int(self.game.ai_game_timer)}s", FONT_SIZE, COLORS['white'])
                 timer_rect = timer_text.get_rect(center=(SCREEN_WIDTH // 2, 70))
-                screen.blit(timer_text, timer_rect)
+                rects.append(screen.blit(timer_text, timer_rect))
+        return rects
@@ -1,7 +1,8 @@
 # input_box.py
 
 import pygame
-from constants import FONT_NAME, FONT_SIZE, COLORS
+from constants import FONT_SIZE, COLORS
+from text_cache import get_font
 
 class InputBox:
     def __init__(self, x, y, w, h, text=''):
@@ -10,7 +11,7 @@ class InputBox:
         self.color_active = COLORS['white']
         self.color = self.color_inactive
         self.text = text
-        self.txt_surface = pygame.font.Font(FONT_NAME, FONT_SIZE).render(text, True, self.color)
+        self.txt_surface = get_font(FONT_SIZE).render(text, True, self.color)
         self.active = False
 
     def handle_event(self, event):
@@ -31,7 +32,7 @@ class InputBox:
                     if len(self.text) < 10:  # Limit name length
                         self.text += event.unicode
                 # Re-render the text
-                self.txt_surface = pygame.font.Font(FONT_NAME, FONT_SIZE).render(self.text, True, self.color)
+                self.txt_surface = get_font(FONT_SIZE).render(self.text, True, self.color)
         return None
 
     def draw(self, screen):
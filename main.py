@@ -10,13 +10,22 @@ def main():
     pygame.display.set_caption("Tetris")
     clock = pygame.time.Clock()
     game = Game(screen)
+    timer = game.frame_timer
 
     while True:
-        game.handle_events()
-        game.update()
-        game.draw()
-        pygame.display.flip()
-        clock.tick(60)  # Limit to 60 frames per second
+        timer.begin_frame()
+        with timer.phase('events'):
+            game.handle_events()
+        with timer.phase('update'):
+            game.update()
+        with timer.phase('draw'):
+            game.draw()
+        game.dirty_rects.add(timer.draw(screen))
+        with timer.phase('flip'):
+            game.dirty_rects.present()
+        with timer.phase('tick'):
+            clock.tick(60)  # Limit to 60 frames per second
+        timer.end_frame()
 
 if __name__ == "__main__":
     main()
@@ -2,14 +2,13 @@
 
 import pygame
 from button import Button
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT, MENU_BACKGROUND_COLOR, FONT_NAME, FONT_SIZE, BUTTON_WIDTH, BUTTON_HEIGHT
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, MENU_BACKGROUND_COLOR, FONT_SIZE, BUTTON_WIDTH, BUTTON_HEIGHT
 from input_box import InputBox
+from text_cache import render_text
 
 class Menu:
     def __init__(self, game):
         self.game = game
-        self.font = pygame.font.Font(FONT_NAME, 36)
-        self.title_font = pygame.font.Font(FONT_NAME, 72)
         self.state = 'main'  # Possible states: 'main', 'rules', 'high_scores', 'ai', 'modes'
         self.selected_mode = None
 
@@ -139,8 +138,7 @@ class Menu:
         """Handle menu events"""
         for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
+                self.game.quit()
             
             # Handle input box events
             if self.state == 'ai':
@@ -201,13 +199,13 @@ class Menu:
 
         y_offset = 50
         for line in description_lines:
-            text = self.font.render(line, True, (255, 255, 255))
+            text = render_text(line, 36, (255, 255, 255))
             rect = text.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
             screen.blit(text, rect)
             y_offset += 30
 
     def draw_main_menu(self, screen):
-        title_text = self.title_font.render("Tetris", True, (255, 255, 255))
+        title_text = render_text("Tetris", 72, (255, 255, 255))
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
         screen.blit(title_text, title_rect)
         for button in self.buttons:
@@ -238,7 +236,7 @@ class Menu:
         ]
         y_offset = 50
         for line in rules_text:
-            text_surf = self.font.render(line, True, (255, 255, 255))
+            text_surf = render_text(line, 36, (255, 255, 255))
             text_rect = text_surf.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
             screen.blit(text_surf, text_rect)
             y_offset += 35
@@ -246,15 +244,13 @@ class Menu:
     def draw_high_scores(self, screen):
         # Display the high scores
         high_scores = self.game.high_score.scores
-        font = pygame.font.Font(FONT_NAME, 48)
-        title = font.render("High Scores", True, (255, 255, 255))
+        title = render_text("High Scores", 48, (255, 255, 255))
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 100))
         screen.blit(title, title_rect)
 
         # Display high scores
-        font_small = pygame.font.Font(FONT_NAME, 36)
         for idx, entry in enumerate(high_scores):
-            score_text = font_small.render(f"{idx + 1}. {entry['name']} - {entry['score']}", True, (255, 255, 255))
+            score_text = render_text(f"{idx + 1}. {entry['name']} - {entry['score']}", 36, (255, 255, 255))
             score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, 200 + idx * 50))
             screen.blit(score_text, score_rect)
 
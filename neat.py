@@ -0,0 +1,450 @@
+# neat.py
+
+import json
+import math
+import random
+from constants import (NEAT_COMPATIBILITY_THRESHOLD, NEAT_DISJOINT_COEFFICIENT, NEAT_WEIGHT_COEFFICIENT,
+                       NEAT_ADD_NODE_RATE, NEAT_ADD_CONNECTION_RATE, NEAT_WEIGHT_MUTATE_RATE,
+                       NEAT_WEIGHT_REPLACE_RATE, NEAT_WEIGHT_PERTURB, NEAT_TOGGLE_RATE, NEAT_CROSSOVER_RATE,
+                       NEAT_ELITISM, NEAT_SURVIVAL_THRESHOLD, NEAT_STAGNATION, NEAT_SPECIES_ELITISM,
+                       NEAT_MIN_SPECIES_SIZE)
+
+# NeuroEvolution of Augmenting Topologies: networks start as inputs wired straight
+# to outputs and grow hidden nodes and connections through mutation. Genes carry
+# innovation numbers so matching structure can be lined up during crossover, and
+# genomes are grouped into species so new structure gets time to be tuned.
+
+ACTIVATIONS = {
+    'identity': lambda x: x,
+    'tanh': math.tanh,
+    'relu': lambda x: x if x > 0 else 0.0,
+    'sigmoid': lambda x: 1 / (1 + math.exp(-max(-60.0, min(60.0, x)))),
+}
+
+HIDDEN_ACTIVATION = 'tanh'
+OUTPUT_ACTIVATION = 'identity'  # Outputs are board scores, so they aren't squashed
+
+
+class NodeGene:
+    """A hidden or output node, input nodes have no genes and use keys -1, -2, ..."""
+    def __init__(self, key, bias=0.0, activation=HIDDEN_ACTIVATION):
+        self.key = key
+        self.bias = bias
+        self.activation = activation
+
+    def copy(self):
+        return NodeGene(self.key, self.bias, self.activation)
+
+
+class ConnectionGene:
+    def __init__(self, in_node, out_node, weight, enabled, innovation):
+        self.in_node = in_node
+        self.out_node = out_node
+        self.weight = weight
+        self.enabled = enabled
+        self.innovation = innovation
+
+    @property
+    def key(self):
+        return (self.in_node, self.out_node)
+
+    def copy(self):
+        return ConnectionGene(self.in_node, self.out_node, self.weight, self.enabled, self.innovation)
+
+
+class InnovationTracker:
+    """Hands out innovation numbers so the same structural change gets the same number in every genome"""
+    def __init__(self, next_node=0):
+        self.innovations = {}   # (in node, out node) -> innovation number
+        self.split_nodes = {}   # innovation of a split connection -> node key that replaced it
+        self.next_innovation = 0
+        self.next_node = next_node
+
+    def get_innovation(self, in_node, out_node):
+        key = (in_node, out_node)
+        if key not in self.innovations:
+            self.innovations[key] = self.next_innovation
+            self.next_innovation += 1
+        return self.innovations[key]
+
+    def get_split_node(self, innovation):
+        if innovation not in self.split_nodes:
+            self.split_nodes[innovation] = self.new_node()
+        return self.split_nodes[innovation]
+
+    def new_node(self):
+        node = self.next_node
+        self.next_node += 1
+        return node
+
+
+def creates_cycle(connections, in_node, out_node):
+    """Check whether adding in_node -> out_node would make the network recurrent"""
+    if in_node == out_node:
+        return True
+    visited = {out_node}
+    stack = [out_node]
+    while stack:
+        node = stack.pop()
+        for a, b in connections:
+            if a == node and b not in visited:
+                if b == in_node:
+                    return True
+                visited.add(b)
+                stack.append(b)
+    return False
+
+
+class Genome:
+    def __init__(self, key, num_inputs, num_outputs):
+        self.key = key
+        self.num_inputs = num_inputs
+        self.num_outputs = num_outputs
+        self.nodes = {}        # Node key -> NodeGene, outputs are 0..num_outputs-1
+        self.connections = {}  # (in node, out node) -> ConnectionGene
+        self.fitness = None
+
+    @property
+    def input_keys(self):
+        return [-i - 1 for i in range(self.num_inputs)]
+
+    @property
+    def output_keys(self):
+        return list(range(self.num_outputs))
+
+    @classmethod
+    def create(cls, key, num_inputs, num_outputs, tracker, rng):
+        """A minimal genome with every input connected to every output"""
+        genome = cls(key, num_inputs, num_outputs)
+        for out_node in genome.output_keys:
+            genome.nodes[out_node] = NodeGene(out_node, 0.0, OUTPUT_ACTIVATION)
+            for in_node in genome.input_keys:
+                innovation = tracker.get_innovation(in_node, out_node)
+                genome.connections[(in_node, out_node)] = ConnectionGene(in_node, out_node, rng.gauss(0, 1),
+                                                                         True, innovation)
+        return genome
+
+    def copy(self, key=None):
+        genome = Genome(self.key if key is None else key, self.num_inputs, self.num_outputs)
+        genome.nodes = {k: node.copy() for k, node in self.nodes.items()}
+        genome.connections = {k: conn.copy() for k, conn in self.connections.items()}
+        genome.fitness = self.fitness
+        return genome
+
+    ###################################
+    # GROUP A SKILL : Graph Traversal #
+    ###################################
+
+    def feed_forward_order(self):
+        """Nodes that affect an output, sorted so every node comes after the nodes feeding it"""
+        enabled = [conn.key for conn in self.connections.values() if conn.enabled]
+
+        # Walk backwards from the outputs to find the nodes that matter
+        required = set(self.output_keys)
+        stack = list(self.output_keys)
+        while stack:
+            node = stack.pop()
+            for a, b in enabled:
+                if b == node and a not in required and a >= 0:
+                    required.add(a)
+                    stack.append(a)
+
+        # Kahn's algorithm over the required nodes
+        incoming = {node: set() for node in required}
+        for a, b in enabled:
+            if b in required and a in required:
+                incoming[b].add(a)
+        order = []
+        ready = sorted(node for node, sources in incoming.items() if not sources)
+        while ready:
+            node = ready.pop(0)
+            order.append(node)
+            for other in sorted(incoming):
+                if node in incoming[other]:
+                    incoming[other].discard(node)
+                    if not incoming[other] and other not in order and other not in ready:
+                        ready.append(other)
+        return order
+
+    def activate(self, inputs):
+        """Reference evaluation, one node at a time in feed-forward order"""
+        values = {key: value for key, value in zip(self.input_keys, inputs)}
+        incoming = {}
+        for conn in self.connections.values():
+            if conn.enabled:
+                incoming.setdefault(conn.out_node, []).append(conn)
+
+        for node in self.feed_forward_order():
+            gene = self.nodes[node]
+            total = gene.bias + sum(values.get(conn.in_node, 0.0) * conn.weight for conn in incoming.get(node, []))
+            values[node] = ACTIVATIONS[gene.activation](total)
+        return [values.get(node, 0.0) for node in self.output_keys]
+
+    def mutate(self, tracker, rng):
+        if rng.random() < NEAT_ADD_NODE_RATE:
+            self.mutate_add_node(tracker, rng)
+        if rng.random() < NEAT_ADD_CONNECTION_RATE:
+            self.mutate_add_connection(tracker, rng)
+
+        for conn in self.connections.values():
+            conn.weight = self.mutate_value(conn.weight, rng)
+            if rng.random() < NEAT_TOGGLE_RATE:
+                conn.enabled = not conn.enabled
+        for node in self.nodes.values():
+            node.bias = self.mutate_value(node.bias, rng)
+
+    def mutate_value(self, value, rng):
+        roll = rng.random()
+        if roll < NEAT_WEIGHT_REPLACE_RATE:
+            return rng.gauss(0, 1)
+        if roll < NEAT_WEIGHT_REPLACE_RATE + NEAT_WEIGHT_MUTATE_RATE:
+            return value + rng.gauss(0, NEAT_WEIGHT_PERTURB)
+        return value
+
+    def mutate_add_node(self, tracker, rng):
+        """Split an enabled connection in two with a new hidden node in the middle"""
+        enabled = [conn for conn in self.connections.values() if conn.enabled]
+        if not enabled:
+            return
+        conn = rng.choice(enabled)
+        node = tracker.get_split_node(conn.innovation)
+        if node in self.nodes:
+            # This genome already split the connection once, so the shared key is taken
+            node = tracker.new_node()
+        conn.enabled = False
+
+        self.nodes[node] = NodeGene(node, 0.0, HIDDEN_ACTIVATION)
+        # The incoming weight of 1 and outgoing old weight keep the network's behaviour close
+        self.add_connection(conn.in_node, node, 1.0, tracker)
+        self.add_connection(node, conn.out_node, conn.weight, tracker)
+
+    def mutate_add_connection(self, tracker, rng):
+        """Connect two unconnected nodes, as long as the network stays feed-forward"""
+        out_node = rng.choice(list(self.nodes))
+        in_node = rng.choice(self.input_keys + [key for key in self.nodes if key not in self.output_keys])
+        if (in_node, out_node) in self.connections:
+            self.connections[(in_node, out_node)].enabled = True
+            return
+        if creates_cycle(self.connections, in_node, out_node):
+            return
+        self.add_connection(in_node, out_node, rng.gauss(0, 1), tracker)
+
+    def add_connection(self, in_node, out_node, weight, tracker):
+        innovation = tracker.get_innovation(in_node, out_node)
+        self.connections[(in_node, out_node)] = ConnectionGene(in_node, out_node, weight, True, innovation)
+
+    def distance(self, other):
+        """Compatibility distance from disjoint genes and the weight difference of matching ones"""
+        mine = {conn.innovation: conn for conn in self.connections.values()}
+        theirs = {conn.innovation: conn for conn in other.connections.values()}
+        matching = mine.keys() & theirs.keys()
+        disjoint = len(mine) + len(theirs) - 2 * len(matching)
+
+        weight_difference = 0.0
+        if matching:
+            weight_difference = sum(abs(mine[i].weight - theirs[i].weight) for i in matching) / len(matching)
+
+        genes = max(len(mine), len(theirs), 1)
+        return NEAT_DISJOINT_COEFFICIENT * disjoint / genes + NEAT_WEIGHT_COEFFICIENT * weight_difference
+
+    def to_dict(self):
+        return {
+            'key': self.key,
+            'num_inputs': self.num_inputs,
+            'num_outputs': self.num_outputs,
+            'fitness': self.fitness,
+            'nodes': [[node.key, node.bias, node.activation] for node in self.nodes.values()],
+            'connections': [[conn.in_node, conn.out_node, conn.weight, conn.enabled, conn.innovation]
+                            for conn in self.connections.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        genome = cls(data['key'], data['num_inputs'], data['num_outputs'])
+        genome.fitness = data.get('fitness')
+        for key, bias, activation in data['nodes']:
+            genome.nodes[key] = NodeGene(key, bias, activation)
+        for in_node, out_node, weight, enabled, innovation in data['connections']:
+            genome.connections[(in_node, out_node)] = ConnectionGene(in_node, out_node, weight, enabled, innovation)
+        return genome
+
+
+def crossover(parent1, parent2, key, rng):
+    """Child genome with matching genes picked at random and the rest taken from the fitter parent"""
+    if (parent2.fitness or 0) > (parent1.fitness or 0):
+        parent1, parent2 = parent2, parent1
+
+    child = Genome(key, parent1.num_inputs, parent1.num_outputs)
+    for conn_key, conn in parent1.connections.items():
+        other = parent2.connections.get(conn_key)
+        if other is None:
+            child.connections[conn_key] = conn.copy()
+            continue
+        gene = (conn if rng.random() < 0.5 else other).copy()
+        # A gene disabled in either parent usually stays disabled
+        if not conn.enabled or not other.enabled:
+            gene.enabled = rng.random() > 0.75
+        child.connections[conn_key] = gene
+
+    for node_key, node in parent1.nodes.items():
+        other = parent2.nodes.get(node_key)
+        child.nodes[node_key] = (node if other is None or rng.random() < 0.5 else other).copy()
+    return child
+
+
+def save_genome(genome, path):
+    try:
+        with open(path, 'w') as f:
+            json.dump(genome.to_dict(), f)
+    except Exception as e:
+        print(f"Error saving genome: {e}")
+
+
+class GenomeLoadError(Exception):
+    pass
+
+
+def load_genome(path):
+    try:
+        with open(path, 'r') as f:
+            return Genome.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise GenomeLoadError(f"Could not load genome from {path}: {e}") from e
+
+
+class Species:
+    def __init__(self, key, representative, generation):
+        self.key = key
+        self.representative = representative
+        self.members = []
+        self.best_fitness = None
+        self.last_improved = generation
+
+    def average_fitness(self):
+        return sum(member.fitness for member in self.members) / len(self.members)
+
+
+class Population:
+    """A generation of genomes split into species, evolved one generation at a time"""
+    def __init__(self, num_inputs, num_outputs, size, seed=None):
+        self.num_inputs = num_inputs
+        self.num_outputs = num_outputs
+        self.size = size
+        self.rng = random.Random(seed)
+        self.tracker = InnovationTracker(next_node=num_outputs)
+        self.generation = 0
+        self.next_genome_key = 0
+        self.next_species_key = 0
+        self.compatibility_threshold = NEAT_COMPATIBILITY_THRESHOLD
+        self.species = {}
+        self.best_genome = None
+        self.genomes = [self.new_genome() for _ in range(size)]
+        self.speciate()
+
+    def new_genome(self):
+        genome = Genome.create(self.next_genome_key, self.num_inputs, self.num_outputs, self.tracker, self.rng)
+        self.next_genome_key += 1
+        return genome
+
+    def speciate(self):
+        """Put each genome in the first species whose representative is close enough"""
+        for species in self.species.values():
+            species.members = []
+
+        for genome in self.genomes:
+            for species in self.species.values():
+                if genome.distance(species.representative) < self.compatibility_threshold:
+                    species.members.append(genome)
+                    break
+            else:
+                species = Species(self.next_species_key, genome, self.generation)
+                species.members.append(genome)
+                self.species[species.key] = species
+                self.next_species_key += 1
+
+        # Drop empty species and pick new representatives for the next generation
+        self.species = {key: species for key, species in self.species.items() if species.members}
+        for species in self.species.values():
+            species.representative = self.rng.choice(species.members)
+
+    def record_fitness(self):
+        """Track the best genome and whether each species is still improving"""
+        for genome in self.genomes:
+            if self.best_genome is None or genome.fitness > self.best_genome.fitness:
+                self.best_genome = genome.copy()
+
+        for species in self.species.values():
+            best = max(member.fitness for member in species.members)
+            if species.best_fitness is None or best > species.best_fitness:
+                species.best_fitness = best
+                species.last_improved = self.generation
+
+    def remove_stagnant_species(self):
+        ranked = sorted(self.species.values(), key=lambda species: species.best_fitness, reverse=True)
+        kept = {}
+        for rank, species in enumerate(ranked):
+            stagnant = self.generation - species.last_improved > NEAT_STAGNATION
+            if rank < NEAT_SPECIES_ELITISM or not stagnant:
+                kept[species.key] = species
+        self.species = kept
+
+    def offspring_counts(self):
+        """Share the next generation between species by their average fitness"""
+        lowest = min(genome.fitness for genome in self.genomes)
+        adjusted = {key: species.average_fitness() - lowest + 1e-6 for key, species in self.species.items()}
+        total = sum(adjusted.values())
+
+        counts = {key: max(NEAT_MIN_SPECIES_SIZE, round(self.size * value / total))
+                  for key, value in adjusted.items()}
+        # Rounding can over or undershoot, trim or pad the fittest species to hit the size exactly
+        best_key = max(adjusted, key=adjusted.get)
+        counts[best_key] = max(1, counts[best_key] + self.size - sum(counts.values()))
+        while sum(counts.values()) > self.size:
+            key = max(counts, key=counts.get)
+            counts[key] -= 1
+        return counts
+
+    def reproduce(self):
+        """Build the next generation from the evaluated one"""
+        self.record_fitness()
+        self.remove_stagnant_species()
+
+        new_genomes = []
+        for key, count in self.offspring_counts().items():
+            members = sorted(self.species[key].members, key=lambda genome: genome.fitness, reverse=True)
+
+            # The best few are copied unchanged so a species never gets worse
+            for genome in members[:min(NEAT_ELITISM, count)]:
+                new_genomes.append(genome.copy())
+            count -= min(NEAT_ELITISM, count)
+
+            parents = members[:max(1, math.ceil(NEAT_SURVIVAL_THRESHOLD * len(members)))]
+            for _ in range(count):
+                parent1 = self.rng.choice(parents)
+                if len(parents) > 1 and self.rng.random() < NEAT_CROSSOVER_RATE:
+                    parent2 = self.rng.choice(parents)
+                    child = crossover(parent1, parent2, self.next_genome_key, self.rng)
+                else:
+                    child = parent1.copy(self.next_genome_key)
+                child.mutate(self.tracker, self.rng)
+                child.fitness = None
+                self.next_genome_key += 1
+                new_genomes.append(child)
+
+        self.genomes = new_genomes
+        self.generation += 1
+        self.speciate()
+
+    def run_generation(self, evaluate_genomes):
+        """Score every genome with evaluate_genomes(genomes), then breed the next generation"""
+        evaluate_genomes(self.genomes)
+        generation_stats = {
+            'generation': self.generation,
+            'champion': max(self.genomes, key=lambda genome: genome.fitness).copy(),
+            'best_fitness': max(genome.fitness for genome in self.genomes),
+            'mean_fitness': sum(genome.fitness for genome in self.genomes) / len(self.genomes),
+            'species': len(self.species),
+            'genomes': len(self.genomes),
+        }
+        self.reproduce()
+        return generation_stats
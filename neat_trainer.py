@@ -0,0 +1,111 @@
+# neat_trainer.py
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from neat import Population, save_genome
+from network_evaluator import FEATURES
+from self_play import make_game_configs, play_game
+from constants import (NEAT_POPULATION_SIZE, NEAT_GENERATIONS, NEAT_GAMES_PER_GENOME, NEAT_MAX_PIECES,
+                       NEAT_HELD_OUT_GAMES, NEAT_GENOME_FILE, SELF_PLAY_BASE_SEED)
+
+# Evolves evaluator networks for TetrisAI by playing headless games. Each
+# generation trains on new piece sequences so nothing is tuned to one game,
+# and every generation's champion is scored on a fixed held-out set of games.
+# The genome doing best there is saved; point AI_GENOME_FILE at it to use it.
+
+def genome_fitness(results):
+    """Lines cleared, plus a little for every piece survived so early genomes can be told apart"""
+    return sum(result['lines'] + result['pieces'] * 0.01 for result in results) / len(results)
+
+
+class FitnessEvaluator:
+    """Plays every genome's games across a process pool and sets genome.fitness"""
+    def __init__(self, executor, games_per_genome, max_pieces, base_seed, held_out_games=NEAT_HELD_OUT_GAMES):
+        self.executor = executor
+        self.games_per_genome = games_per_genome
+        self.max_pieces = max_pieces
+        self.base_seed = base_seed
+        self.held_out_games = held_out_games
+        self.generation = 0
+        self.last_elapsed = 0
+
+    def training_seed(self):
+        """First seed of this generation's games, the held-out games keep the seeds before them all"""
+        return self.base_seed + self.held_out_games + self.generation * self.games_per_genome
+
+    def play(self, genomes, games, base_seed):
+        """Average fitness of each genome over the same `games` seeded games"""
+        configs = []
+        for genome in genomes:
+            # Greedy search keeps training fast, every genome sees the same pieces
+            configs.extend(make_game_configs(games, base_seed, max_pieces=self.max_pieces,
+                                             depth=1, genome=genome.to_dict()))
+
+        if self.executor is None:
+            results = [play_game(config) for config in configs]
+        else:
+            results = list(self.executor.map(play_game, configs, chunksize=1))
+        return [genome_fitness(results[i * games:(i + 1) * games]) for i in range(len(genomes))]
+
+    def __call__(self, genomes):
+        start_time = time.perf_counter()
+        for genome, fitness in zip(genomes, self.play(genomes, self.games_per_genome, self.training_seed())):
+            genome.fitness = fitness
+        self.generation += 1
+        self.last_elapsed = time.perf_counter() - start_time
+
+    def held_out_fitness(self, genome):
+        return self.play([genome], self.held_out_games, self.base_seed)[0]
+
+
+def train(generations=NEAT_GENERATIONS, population_size=NEAT_POPULATION_SIZE, workers=None,
+          games_per_genome=NEAT_GAMES_PER_GENOME, max_pieces=NEAT_MAX_PIECES, seed=None,
+          base_seed=SELF_PLAY_BASE_SEED, output_file=NEAT_GENOME_FILE):
+    """Run the trainer and return the best genome found"""
+    population = Population(len(FEATURES), 1, population_size, seed)
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    best_genome = None
+    best_held_out = None
+    try:
+        evaluate = FitnessEvaluator(executor, games_per_genome, max_pieces, base_seed)
+        for _ in range(generations):
+            stats = population.run_generation(evaluate)
+            genomes_per_minute = stats['genomes'] / evaluate.last_elapsed * 60 if evaluate.last_elapsed else 0
+
+            # Training games change every generation, so champions are compared on the held-out games
+            held_out = evaluate.held_out_fitness(stats['champion'])
+            if best_held_out is None or held_out > best_held_out:
+                best_genome, best_held_out = stats['champion'], held_out
+                save_genome(best_genome, output_file)
+            print(f"Generation {stats['generation']:>3}: best {stats['best_fitness']:8.2f}  "
+                  f"mean {stats['mean_fitness']:8.2f}  held-out {held_out:8.2f}  species {stats['species']:>3}  "
+                  f"{genomes_per_minute:8.1f} genomes/min")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return best_genome
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evolve TetrisAI evaluator networks with NEAT")
+    parser.add_argument('--generations', type=int, default=NEAT_GENERATIONS)
+    parser.add_argument('--population', type=int, default=NEAT_POPULATION_SIZE)
+    parser.add_argument('--workers', type=int, default=None, help="Processes to use, defaults to one per core")
+    parser.add_argument('--games', type=int, default=NEAT_GAMES_PER_GENOME, help="Games per genome")
+    parser.add_argument('--max-pieces', type=int, default=NEAT_MAX_PIECES)
+    parser.add_argument('--seed', type=int, default=None, help="Seed for evolution")
+    parser.add_argument('--output', default=NEAT_GENOME_FILE)
+    args = parser.parse_args()
+
+    best = train(args.generations, args.population, args.workers, args.games, args.max_pieces,
+                 args.seed, output_file=args.output)
+    print(f"Best training fitness {best.fitness:.2f}, saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
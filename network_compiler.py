@@ -0,0 +1,78 @@
+# network_compiler.py
+
+import numpy as np
+
+# Turns a genome into a stack of layers so a whole batch of boards goes through
+# the network as a few matrix multiplies instead of one Python call per node.
+
+NUMPY_ACTIVATIONS = {
+    'identity': lambda x: x,
+    'tanh': np.tanh,
+    'relu': lambda x: np.maximum(x, 0.0),
+    'sigmoid': lambda x: 1 / (1 + np.exp(-np.clip(x, -60.0, 60.0))),
+}
+
+
+class CompiledLayer:
+    """Nodes whose inputs are all computed by earlier layers"""
+    def __init__(self, weights, biases, activations, start):
+        self.weights = weights    # (columns before this layer, nodes in layer)
+        self.biases = biases
+        self.start = start        # Column of the first node in the value buffer
+        # Nodes grouped by activation so each function runs once per layer
+        self.activation_groups = []
+        for name in sorted(set(activations)):
+            indices = np.array([i for i, activation in enumerate(activations) if activation == name])
+            self.activation_groups.append((NUMPY_ACTIVATIONS[name], indices))
+
+
+class CompiledNetwork:
+    """A genome compiled into layered weight matrices for batched evaluation"""
+    def __init__(self, genome):
+        self.num_inputs = genome.num_inputs
+        order = genome.feed_forward_order()
+
+        incoming = {}
+        for conn in genome.connections.values():
+            if conn.enabled:
+                incoming.setdefault(conn.out_node, []).append(conn)
+
+        # A node's depth is one more than the deepest node feeding it, inputs are depth 0
+        depth = {key: 0 for key in genome.input_keys}
+        for node in order:
+            depth[node] = 1 + max((depth[conn.in_node] for conn in incoming.get(node, [])), default=0)
+
+        layers = {}
+        for node in order:
+            layers.setdefault(depth[node], []).append(node)
+
+        # Every value lives in one buffer: inputs first, then each layer's nodes in turn
+        self.columns = {key: i for i, key in enumerate(genome.input_keys)}
+        self.layers = []
+        for layer_depth in sorted(layers):
+            nodes = layers[layer_depth]
+            start = len(self.columns)
+            weights = np.zeros((start, len(nodes)))
+            for j, node in enumerate(nodes):
+                for conn in incoming.get(node, []):
+                    weights[self.columns[conn.in_node], j] += conn.weight
+            biases = np.array([genome.nodes[node].bias for node in nodes])
+            activations = [genome.nodes[node].activation for node in nodes]
+            self.layers.append(CompiledLayer(weights, biases, activations, start))
+            for j, node in enumerate(nodes):
+                self.columns[node] = start + j
+
+        self.output_columns = [self.columns[key] for key in genome.output_keys]
+        self.width = len(self.columns)
+
+    def activate(self, inputs):
+        """Evaluate an (N, num_inputs) array, returning an (N, num_outputs) array"""
+        inputs = np.asarray(inputs, dtype=float)
+        values = np.empty((inputs.shape[0], self.width))
+        values[:, :self.num_inputs] = inputs
+
+        for layer in self.layers:
+            totals = values[:, :layer.start] @ layer.weights + layer.biases
+            for activation, indices in layer.activation_groups:
+                values[:, layer.start + indices] = activation(totals[:, indices])
+        return values[:, self.output_columns]
@@ -0,0 +1,45 @@
+# network_evaluator.py
+
+import numpy as np
+from neat import load_genome
+from network_compiler import CompiledNetwork
+
+# Board features fed to evolved networks, in input order, with the scale that
+# brings each one to roughly the -1..1 range so tanh nodes don't saturate
+FEATURES = ('aggregate_height', 'maximum_height', 'surface_variance', 'covered_holes')
+FEATURE_SCALES = {
+    'aggregate_height': 1 / 100,
+    'maximum_height': 1 / 20,
+    'surface_variance': 1 / 25,
+    'covered_holes': 1 / 20,
+}
+
+
+def feature_vector(heuristics):
+    return [heuristics[name] * FEATURE_SCALES[name] for name in FEATURES]
+
+
+class NetworkEvaluator:
+    """Scores boards with an evolved genome instead of TetrisAI's fixed weights"""
+    def __init__(self, genome):
+        self.genome = genome
+        self.network = CompiledNetwork(genome)
+        self.scales = np.array([FEATURE_SCALES[name] for name in FEATURES])
+
+    @classmethod
+    def load(cls, path):
+        return cls(load_genome(path))
+
+    def score(self, heuristics):
+        """Score one board from its heuristics dict"""
+        return self.genome.activate(feature_vector(heuristics))[0]
+
+    def evaluate(self, heuristics):
+        """Score a batch from the per-feature arrays returned by BatchEvaluator.calculate_heuristics"""
+        features = np.column_stack([heuristics[name] for name in FEATURES]) * self.scales
+        return self.network.activate(features)[:, 0]
+
+    def evaluate_reference(self, heuristics):
+        """Same as evaluate, but running the genome node by node for every board"""
+        columns = [heuristics[name] * FEATURE_SCALES[name] for name in FEATURES]
+        return [self.genome.activate(inputs)[0] for inputs in zip(*columns)]
@@ -1,80 +1,114 @@
-# particle.py
+# particle.py
 
 import pygame
-import random
-import math
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
-
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.original_size = random.randint(4, 8)
-        self.size = self.original_size
-        
-        # Random angle and speed for natural movement
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(100, 300)
-        self.speed_x = math.cos(angle) * speed
-        self.speed_y = math.sin(angle) * speed
-        
-        self.lifetime = random.uniform(0.5, 1.0)
-        self.max_lifetime = self.lifetime
-        self.gravity = 400  # Add gravity effect
+import numpy as np
+from constants import PARTICLE_CAPACITY, PARTICLE_GRAVITY, PARTICLE_ALPHA_LEVELS, PARTICLE_SPRITE_CACHE_SIZE
+from lru import LRUCache
 
-    def update(self, dt):
-        # Update position with gravity
-        self.speed_y += self.gravity * dt
-        self.x += self.speed_x * dt
-        self.y += self.speed_y * dt
-        
-        # Update lifetime and size
-        self.lifetime -= dt
-        life_ratio = self.lifetime / self.max_lifetime
-        self.size = self.original_size * life_ratio
 
-    def draw(self, screen):
-        if self.lifetime > 0:
-            # Calculate alpha based on remaining lifetime
-            alpha = int(255 * (self.lifetime / self.max_lifetime))
-            
-            # Create a surface for the particle with transparency
-            particle_surface = pygame.Surface((int(self.size * 2), int(self.size * 2)), pygame.SRCALPHA)
-            
-            # Get RGB values from the color and add alpha
-            if isinstance(self.color, tuple):
-                r, g, b = self.color[:3]
-            else:  # If color is an integer (from grid cells)
-                r, g, b = 255, 255, 255  # Default to white if color format is unexpected
-            
-            # Draw the particle with transparency
-            pygame.draw.circle(
-                particle_surface,
-                (r, g, b, alpha),
-                (int(self.size), int(self.size)),
-                int(self.size)
-            )
-            
-            # Blit the particle surface onto the screen
-            screen.blit(
-                particle_surface,
-                (int(self.x - self.size), int(self.y - self.size))
-            )
+class SpriteAtlas(LRUCache):
+    """Pre-rendered particle circles keyed by (color, radius, alpha level), least recently used dropped first"""
+    def __init__(self, max_sprites=PARTICLE_SPRITE_CACHE_SIZE, alpha_levels=PARTICLE_ALPHA_LEVELS):
+        super().__init__(max_sprites)
+        self.alpha_levels = alpha_levels
+
+    def quantize_alphas(self, alphas):
+        """Round 0-255 alphas to the nearest of alpha_levels evenly spaced steps"""
+        steps = self.alpha_levels - 1
+        return (np.rint(alphas * steps / 255) * 255 // steps).astype(int)
+
+    def sprite(self, color, radius, alpha):
+        key = (color, radius, alpha)
+        sprite = self.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color + (alpha,), (radius, radius), radius)
+            self.put(key, sprite)
+        return sprite
+
 
 class ParticleSystem:
-    def __init__(self):
-        self.particles = []
+    """Particles kept as columns of preallocated arrays, the live ones packed at the front"""
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.speed_x = np.zeros(capacity)
+        self.speed_y = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity)
+        self.max_lifetime = np.ones(capacity)
+        self.original_size = np.zeros(capacity)
+        self.colors = np.zeros((capacity, 3), dtype=np.uint8)
+        self.random = np.random.default_rng()
+        self.dropped = 0  # Particles not spawned because the system was full
+        self.atlas = SpriteAtlas()
+
+    def add_burst(self, xs, ys, colors, per_point=1):
+        """Spawn per_point particles at each (x, y) in one go, anything past capacity is dropped"""
+        total = len(xs) * per_point
+        start = self.count
+        end = min(self.capacity, start + total)
+        spawned = end - start
+        self.dropped += total - spawned
+        if spawned <= 0:
+            return
+
+        self.x[start:end] = np.repeat(np.asarray(xs, dtype=float), per_point)[:spawned]
+        self.y[start:end] = np.repeat(np.asarray(ys, dtype=float), per_point)[:spawned]
+        # Colors that aren't RGB tuples show up white
+        rgb = [color[:3] if isinstance(color, tuple) else (255, 255, 255) for color in colors]
+        self.colors[start:end] = np.repeat(np.asarray(rgb, dtype=np.uint8), per_point, axis=0)[:spawned]
+
+        # Random angle and speed for natural movement
+        angle = self.random.uniform(0, 2 * np.pi, spawned)
+        speed = self.random.uniform(100, 300, spawned)
+        self.speed_x[start:end] = np.cos(angle) * speed
+        self.speed_y[start:end] = np.sin(angle) * speed
+        self.lifetime[start:end] = self.random.uniform(0.5, 1.0, spawned)
+        self.max_lifetime[start:end] = self.lifetime[start:end]
+        self.original_size[start:end] = self.random.integers(4, 9, spawned)
+        self.count = end
 
     def add_particle(self, x, y, color):
-        self.particles.append(Particle(x, y, color))
+        self.add_burst([x], [y], [color])
 
     def update(self, dt):
-        # Update particles and remove dead ones
-        self.particles = [p for p in self.particles if p.lifetime > 0]
-        for particle in self.particles:
-            particle.update(dt)
+        n = self.count
+        if not n:
+            return
+        # Move everything with gravity, then pack the survivors back to the front
+        self.speed_y[:n] += PARTICLE_GRAVITY * dt
+        self.x[:n] += self.speed_x[:n] * dt
+        self.y[:n] += self.speed_y[:n] * dt
+        self.lifetime[:n] -= dt
+
+        alive = self.lifetime[:n] > 0
+        survivors = int(np.count_nonzero(alive))
+        if survivors < n:
+            for column in (self.x, self.y, self.speed_x, self.speed_y, self.lifetime,
+                           self.max_lifetime, self.original_size, self.colors):
+                column[:survivors] = column[:n][alive]
+            self.count = survivors
+
+    def sizes(self):
+        n = self.count
+        return self.original_size[:n] * (self.lifetime[:n] / self.max_lifetime[:n])
 
     def draw(self, screen):
-        for particle in self.particles:
-            particle.draw(screen)
+        """Draw every particle from the sprite atlas in one blits call, returning the areas drawn"""
+        n = self.count
+        if not n:
+            return []
+        sizes = self.sizes()
+        radii = sizes.astype(int)
+        alphas = self.atlas.quantize_alphas(255 * (self.lifetime[:n] / self.max_lifetime[:n]))
+        left = (self.x[:n] - sizes).astype(int)
+        top = (self.y[:n] - sizes).astype(int)
+
+        get_sprite = self.atlas.sprite
+        batch = [(get_sprite((r, g, b), radius, alpha), (x, y))
+                 for radius, alpha, (r, g, b), x, y in zip(radii.tolist(), alphas.tolist(), self.colors[:n].tolist(),
+                                                           left.tolist(), top.tolist())
+                 if radius > 0]  # Shrunk below a pixel, nothing left to draw
+        return screen.blits(batch)
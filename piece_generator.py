@@ -1,7 +1,7 @@
 # piece_generator.py
 
-import random
 from tetromino import Tetromino
+from shape_stream import ShapeStream
 
 class Queue:
     """A simple queue implementation with basic operations"""
@@ -45,8 +45,10 @@ class Queue:
 
 
 class PieceGenerator:
-    def __init__(self, grid):
+    def __init__(self, grid, seed=None):
         self.grid = grid
+        self.seed = seed
+        self.shapes = ShapeStream(seed)  # Generators given the same seed deal the same pieces
         # Initialize bag and next_pieces as Queues.
         self.bag = Queue()  # No capacity limit needed for the bag.
         self.next_pieces = Queue(capacity=5)  # Queue for next pieces with capacity 5.
@@ -55,8 +57,7 @@ class PieceGenerator:
         self.fill_queue()      # Fill the initial queue
 
     def generate_new_bag(self):
-        pieces = list('IOTSZJL')
-        random.shuffle(pieces)
+        pieces = [self.shapes.next_shape() for _ in range(7)]
 
         ####################################
         # GROUP A SKILL : Queue Operations #
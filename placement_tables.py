@@ -0,0 +1,76 @@
+# placement_tables.py
+
+from collections import namedtuple
+from constants import SHAPES, GRID_WIDTH
+
+# Everything the AI needs to know about one rotation of one shape
+RotationTable = namedtuple('RotationTable', [
+    'shape_name',  # Key into SHAPES
+    'rotation',    # Rotation state, 0-3 clockwise from spawn
+    'matrix',      # Rotated shape matrix as a tuple of tuples
+    'cells',       # (column offset, row offset) of every block
+    'rows',        # (row offset, mask) with bit 0 of the mask at the leftmost filled column
+    'left',        # Leftmost filled column of the matrix
+    'right',       # Rightmost filled column of the matrix
+    'bottoms',     # (column offset, lowest row offset) for every filled column
+    'x_range',     # Legal x positions on a GRID_WIDTH wide board
+])
+
+
+def rotate_clockwise(matrix):
+    """Same zip rotation as Tetromino.rotate so the matrices line up"""
+    return tuple(tuple(row) for row in zip(*matrix[::-1]))
+
+
+def build_rotation_table(shape_name, rotation, matrix, width=GRID_WIDTH):
+    cells = tuple((x, y) for y, row in enumerate(matrix) for x, cell in enumerate(row) if cell)
+    left = min(x for x, _ in cells)
+    right = max(x for x, _ in cells)
+
+    rows = []
+    for y, row in enumerate(matrix):
+        mask = 0
+        for x, cell in enumerate(row):
+            if cell:
+                mask |= 1 << (x - left)
+        if mask:
+            rows.append((y, mask))
+
+    bottoms = {}
+    for x, y in cells:
+        bottoms[x] = max(y, bottoms.get(x, y))
+
+    return RotationTable(
+        shape_name=shape_name,
+        rotation=rotation,
+        matrix=matrix,
+        cells=cells,
+        rows=tuple(rows),
+        left=left,
+        right=right,
+        bottoms=tuple(sorted(bottoms.items())),
+        x_range=range(-left, width - right),
+    )
+
+
+def build_placement_tables(width=GRID_WIDTH):
+    tables = {}
+    for shape_name, shape in SHAPES.items():
+        matrix = tuple(tuple(row) for row in shape)
+        rotations = []
+        for rotation in range(4):
+            rotations.append(build_rotation_table(shape_name, rotation, matrix, width))
+            matrix = rotate_clockwise(matrix)
+        tables[shape_name] = tuple(rotations)
+    return tables
+
+
+# Built once at import time, indexed as PLACEMENT_TABLES[shape_name][rotation]
+PLACEMENT_TABLES = build_placement_tables()
+
+
+def legal_x_range(table, width):
+    """x positions that keep every block of the rotation inside a board of this width"""
+    if width == GRID_WIDTH:
+        return table.x_range
+    return range(-table.left, width - table.right)
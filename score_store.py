@@ -0,0 +1,180 @@
+# score_store.py
+
+import json
+import sqlite3
+import time
+from constants import HIGH_SCORE_ENCRYPTION_KEY
+from encrypt import Encrypt
+
+# SQLite storage for high scores and AI game results. Every game is kept, and
+# the indexes let rank and leaderboard queries stay fast however long the
+# history gets. Scores have to stay readable for the indexes to work, so
+# encryption at rest covers player names only.
+#
+# To keep the tamper protection the encrypted high score file gave, every high
+# score row also carries a seal: its name and score encrypted with the high
+# score key. The high score list skips rows whose seal doesn't match, but rank
+# and count queries run on the index and count every row. AI results are
+# stored unprotected, as they always were in ai_scores.json.
+#
+# Writes are synchronous on the thread that opened the store, not queued on
+# the score writer: a connection belongs to the thread that opened it, and each
+# insert is a single small transaction.
+
+AI_SCORE_FIELDS = ('score', 'ai_score', 'score_difference', 'keys_per_piece', 'pieces_per_second',
+                   'delay', 'total_pieces', 'game_duration')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS high_scores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    created REAL NOT NULL,
+    seal TEXT
+);
+CREATE INDEX IF NOT EXISTS high_scores_score ON high_scores (score);
+
+CREATE TABLE IF NOT EXISTS ai_scores (
+    id INTEGER PRIMARY KEY,
+    score INTEGER,
+    ai_score INTEGER,
+    score_difference INTEGER NOT NULL,
+    keys_per_piece REAL,
+    pieces_per_second REAL,
+    delay INTEGER NOT NULL,
+    total_pieces INTEGER,
+    game_duration REAL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ai_scores_delay_difference ON ai_scores (delay, score_difference);
+"""
+
+
+class SQLiteScoreStore:
+    """High scores and AI results in one SQLite database, names encrypted when given an Encrypt"""
+    def __init__(self, path, encryptor=None):
+        self.path = path
+        self.encryptor = encryptor
+        self.sealer = Encrypt(HIGH_SCORE_ENCRYPTION_KEY)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+        self.add_seals()
+
+    def close(self):
+        self.connection.close()
+
+    def scalar(self, query, parameters=()):
+        return self.connection.execute(query, parameters).fetchone()[0]
+
+    def encrypt_name(self, name):
+        return self.encryptor.encrypt_text(name) if self.encryptor else name
+
+    def decrypt_name(self, name):
+        if not self.encryptor:
+            return name
+        try:
+            return self.encryptor.decrypt_text(name)
+        except Exception:
+            return name  # Stored before encryption was turned on
+
+    # High scores
+
+    def add_seals(self):
+        """Give databases made before high scores were sealed the seal column, sealing the rows already there"""
+        columns = [row['name'] for row in self.connection.execute("PRAGMA table_info(high_scores)")]
+        if 'seal' in columns:
+            return
+        with self.connection:
+            self.connection.execute("ALTER TABLE high_scores ADD COLUMN seal TEXT")
+            rows = self.connection.execute("SELECT id, name, score FROM high_scores").fetchall()
+            self.connection.executemany("UPDATE high_scores SET seal = ? WHERE id = ?",
+                                        [(self.seal(row['name'], row['score']), row['id']) for row in rows])
+
+    def seal(self, stored_name, score):
+        return self.sealer.encrypt_text(json.dumps([stored_name, score]))
+
+    def is_sealed(self, row):
+        """Whether the row's name and score are the ones it was saved with"""
+        try:
+            return json.loads(self.sealer.decrypt_text(row['seal'])) == [row['name'], row['score']]
+        except Exception:
+            return False  # Missing or edited seal
+
+    def high_score_row(self, name, score):
+        stored_name = self.encrypt_name(name)
+        return stored_name, score, time.time(), self.seal(stored_name, score)
+
+    def add_high_score(self, name, score):
+        with self.connection:
+            self.connection.execute("INSERT INTO high_scores (name, score, created, seal) VALUES (?, ?, ?, ?)",
+                                    self.high_score_row(name, score))
+
+    def add_high_scores(self, entries):
+        with self.connection:
+            self.connection.executemany("INSERT INTO high_scores (name, score, created, seal) VALUES (?, ?, ?, ?)",
+                                        [self.high_score_row(e['name'], e['score']) for e in entries])
+
+    def top_high_scores(self, count):
+        """The best count scores, leaving out rows edited outside the game"""
+        scores = []
+        for row in self.connection.execute("SELECT name, score, seal FROM high_scores ORDER BY score DESC, id"):
+            if self.is_sealed(row):
+                scores.append({'name': self.decrypt_name(row['name']), 'score': row['score']})
+                if len(scores) == count:
+                    break
+        return scores
+
+    def high_score_rank(self, score):
+        """Place the score would take among every recorded game"""
+        return self.scalar("SELECT COUNT(*) FROM high_scores WHERE score > ?", (score,)) + 1
+
+    def high_score_count(self):
+        return self.scalar("SELECT COUNT(*) FROM high_scores")
+
+    # AI results
+
+    def add_ai_scores(self, records):
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO ai_scores ({', '.join(AI_SCORE_FIELDS)}, created) "
+                f"VALUES ({', '.join('?' for _ in AI_SCORE_FIELDS)}, ?)",
+                [tuple(record.get(field) for field in AI_SCORE_FIELDS) + (now,) for record in records])
+
+    def add_ai_score(self, record):
+        self.add_ai_scores([record])
+
+    def ai_count(self, delay=None):
+        if delay is None:
+            return self.scalar("SELECT COUNT(*) FROM ai_scores")
+        return self.scalar("SELECT COUNT(*) FROM ai_scores WHERE delay = ?", (delay,))
+
+    def ai_rank(self, delay, score_difference):
+        """One place behind every game at this delay with a better score difference"""
+        return self.scalar("SELECT COUNT(*) FROM ai_scores WHERE delay = ? AND score_difference > ?",
+                           (delay, score_difference)) + 1
+
+    def ai_percentile(self, delay, score_difference):
+        """Percentage of games at this delay the score difference matches or beats"""
+        total = self.ai_count(delay)
+        if not total:
+            return 100.0
+        at_or_below = self.scalar("SELECT COUNT(*) FROM ai_scores WHERE delay = ? AND score_difference <= ?",
+                                  (delay, score_difference))
+        return at_or_below / total * 100
+
+    def ai_histogram(self, delay, bucket_size):
+        """(bucket start, games) for each bucket of score differences that has any games"""
+        # SQLite's % keeps the sign of the left side, this rounds negative differences down too
+        rows = self.connection.execute(
+            "SELECT score_difference - ((score_difference % ?) + ?) % ? AS bucket, COUNT(*) "
+            "FROM ai_scores WHERE delay = ? GROUP BY bucket ORDER BY bucket",
+            (bucket_size, bucket_size, bucket_size, delay))
+        return [(row[0], row[1]) for row in rows]
+
+    def ai_top(self, delay, count):
+        rows = self.connection.execute(
+            f"SELECT {', '.join(AI_SCORE_FIELDS)} FROM ai_scores WHERE delay = ? "
+            "ORDER BY score_difference DESC, id LIMIT ?", (delay, count))
+        return [dict(row) for row in rows]
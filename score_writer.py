@@ -0,0 +1,89 @@
+# score_writer.py
+
+import atexit
+import os
+import queue
+import threading
+from pathlib import Path
+from constants import SCORE_BACKGROUND_WRITES, SCORE_WRITE_QUEUE_SIZE
+
+# Score files are written on a background thread so saving at the end of a game
+# never holds up the frame that shows the results. Writes with the same key are
+# coalesced, only the latest one pending for a key runs.
+
+
+def atomic_write(path, text):
+    """Replace the file in one step, so a crash leaves either the old contents or the new"""
+    temp_path = Path(str(path) + '.tmp')
+    with open(temp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class BackgroundWriter:
+    """One worker thread running queued writes in order"""
+    def __init__(self, enabled=SCORE_BACKGROUND_WRITES, max_pending=SCORE_WRITE_QUEUE_SIZE):
+        self.enabled = enabled
+        self.queue = queue.Queue(maxsize=max_pending)  # Submitting blocks while this many writes wait
+        self.pending = {}  # key -> latest write for that key still waiting in the queue
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.unfinished = 0
+        self.thread = None
+        self.writes = 0
+        self.coalesced = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='score-writer', daemon=True)
+        self.thread.start()
+        atexit.register(self.flush)  # Quitting exits straight from the event loop
+
+    def submit(self, write, key=None):
+        """Queue a write, replacing any write still waiting under the same key. None never coalesces."""
+        if not self.enabled:
+            self.run_write(write)
+            return
+        with self.lock:
+            if self.thread is None:
+                self.start()
+            if key is not None and key in self.pending:
+                self.pending[key] = write
+                self.coalesced += 1
+                return
+            if key is not None:
+                self.pending[key] = write
+            self.unfinished += 1
+        self.queue.put((key, write))
+
+    def run(self):
+        while True:
+            key, write = self.queue.get()
+            if key is not None:
+                with self.lock:
+                    write = self.pending.pop(key)
+            self.run_write(write)
+            with self.lock:
+                self.unfinished -= 1
+                if self.unfinished == 0:
+                    self.idle.notify_all()
+
+    def run_write(self, write):
+        try:
+            write()
+            self.writes += 1
+        except Exception as e:
+            print(f"Error saving scores: {e}")
+
+    def flush(self, timeout=None):
+        """Wait until every queued write is on disk, False if the timeout ran out first"""
+        with self.lock:
+            return self.idle.wait_for(lambda: self.unfinished == 0, timeout)
+
+
+SCORE_WRITER = BackgroundWriter()
+
+
+def wait_for_writes(timeout=None):
+    return SCORE_WRITER.flush(timeout)
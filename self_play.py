@@ -0,0 +1,158 @@
+# self_play.py
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from engine import TetrisEngine
+from tetris_ai import TetrisAI
+from beam_search import BeamSearchPlanner
+from neat import Genome, load_genome
+from network_evaluator import NetworkEvaluator
+from constants import (AI_SEARCH_DEPTH, AI_BEAM_WIDTH, SELF_PLAY_GAMES, SELF_PLAY_MAX_PIECES,
+                       SELF_PLAY_BASE_SEED)
+
+# Plays many headless AI games across a process pool so weight changes can be
+# judged on hundreds of games instead of one 60 second game in the GUI.
+
+def make_game_configs(games, base_seed=SELF_PLAY_BASE_SEED, weights=None, hold_threshold=None,
+                      max_pieces=SELF_PLAY_MAX_PIECES, depth=AI_SEARCH_DEPTH, beam_width=AI_BEAM_WIDTH,
+                      genome=None):
+    """One config per game, seeds run on from base_seed so every run deals the same pieces"""
+    return [{
+        'seed': base_seed + i,
+        'weights': weights,
+        'genome': genome,  # Genome dict to score boards with instead of the weights
+        'hold_threshold': hold_threshold,
+        'max_pieces': max_pieces,
+        'depth': depth,
+        'beam_width': beam_width,
+    } for i in range(games)]
+
+
+def create_ai(config):
+    ai = TetrisAI()
+    if config.get('weights'):
+        # Update in place, the batch evaluator shares this dict
+        ai.weights.update(config['weights'])
+    if config.get('genome'):
+        ai.set_evaluator(NetworkEvaluator(Genome.from_dict(config['genome'])))
+    if config.get('hold_threshold') is not None:
+        ai.hold_threshold = config['hold_threshold']
+    ai.planner = BeamSearchPlanner(ai, depth=config.get('depth', AI_SEARCH_DEPTH),
+                                   beam_width=config.get('beam_width', AI_BEAM_WIDTH))
+    return ai
+
+
+def play_game(config):
+    """Play one game to game over or the piece cap, runs inside a worker process"""
+    ai = create_ai(config)
+    engine = TetrisEngine(seed=config['seed'])
+    max_pieces = config.get('max_pieces')
+
+    start_time = time.perf_counter()
+    while not engine.game_over and (not max_pieces or engine.pieces_placed < max_pieces):
+        best_move = ai.get_best_move(engine.board, engine.current_piece, engine.held_piece,
+                                     engine.preview(), engine.can_hold)
+        if best_move is None:
+            break
+        engine.play_move(best_move)
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        'seed': config['seed'],
+        'score': engine.score.score,
+        'lines': engine.lines_cleared,
+        'pieces': engine.pieces_placed,
+        'topped_out': engine.game_over,
+        'seconds': elapsed,
+        'pieces_per_second': engine.pieces_placed / elapsed if elapsed > 0 else 0,
+    }
+
+
+def run_games(configs, workers=None):
+    """Play every config, spread over one process per core unless told otherwise"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [play_game(config) for config in configs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Games vary a lot in length, so hand them out one at a time
+        return list(executor.map(play_game, configs, chunksize=1))
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def distribution(values):
+    values = sorted(values)
+    if not values:
+        return {}
+    return {
+        'mean': statistics.fmean(values),
+        'stdev': statistics.stdev(values) if len(values) > 1 else 0.0,
+        'min': values[0],
+        'p10': percentile(values, 0.10),
+        'median': statistics.median(values),
+        'p90': percentile(values, 0.90),
+        'max': values[-1],
+    }
+
+
+def summarize(results):
+    """Aggregate per-game results into a distribution for each metric"""
+    summary = {'games': len(results), 'topped_out': sum(1 for result in results if result['topped_out'])}
+    for key in ('score', 'lines', 'pieces', 'pieces_per_second'):
+        summary[key] = distribution([result[key] for result in results])
+    return summary
+
+
+def run_self_play(games=SELF_PLAY_GAMES, workers=None, **config):
+    """Play a batch of games and return (results, summary)"""
+    start_time = time.perf_counter()
+    results = run_games(make_game_configs(games, **config), workers)
+    summary = summarize(results)
+    summary['wall_seconds'] = time.perf_counter() - start_time
+    return results, summary
+
+
+def print_summary(summary):
+    print(f"{summary['games']} games, {summary['topped_out']} topped out, "
+          f"{summary['wall_seconds']:.1f}s wall time")
+    for key in ('score', 'lines', 'pieces', 'pieces_per_second'):
+        stats = summary[key]
+        print(f"  {key:<18} mean {stats['mean']:>10.1f}  stdev {stats['stdev']:>9.1f}  "
+              f"min {stats['min']:>9.1f}  median {stats['median']:>9.1f}  max {stats['max']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless AI games in parallel")
+    parser.add_argument('--games', type=int, default=SELF_PLAY_GAMES)
+    parser.add_argument('--workers', type=int, default=None, help="Processes to use, defaults to one per core")
+    parser.add_argument('--seed', type=int, default=SELF_PLAY_BASE_SEED, help="Seed of the first game")
+    parser.add_argument('--max-pieces', type=int, default=SELF_PLAY_MAX_PIECES, help="0 plays until top out")
+    parser.add_argument('--depth', type=int, default=AI_SEARCH_DEPTH)
+    parser.add_argument('--beam-width', type=int, default=AI_BEAM_WIDTH)
+    parser.add_argument('--hold-threshold', type=float, default=None)
+    parser.add_argument('--genome', default=None, help="Score boards with a genome file from neat_trainer.py")
+    parser.add_argument('--weight', action='append', default=[], metavar='NAME=VALUE',
+                        help="Override one heuristic weight, can be repeated")
+    args = parser.parse_args()
+
+    weights = {}
+    for override in args.weight:
+        name, _, value = override.partition('=')
+        weights[name] = float(value)
+
+    genome = load_genome(args.genome).to_dict() if args.genome else None
+    _, summary = run_self_play(args.games, args.workers, base_seed=args.seed, weights=weights,
+                               hold_threshold=args.hold_threshold, max_pieces=args.max_pieces,
+                               depth=args.depth, beam_width=args.beam_width, genome=genome)
+    print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
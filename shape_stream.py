@@ -0,0 +1,55 @@
+# shape_stream.py
+
+import random
+from array import array
+
+# Shape ids are indexes into SHAPE_ORDER, so a whole sequence fits in one byte per piece
+SHAPE_ORDER = 'IOTSZJL'
+SHAPE_IDS = {shape: i for i, shape in enumerate(SHAPE_ORDER)}
+
+
+def generate_bags(rng, bags):
+    """Shuffle `bags` 7-bags with the given Random and return their shape ids back to back"""
+    stream = array('b')
+    for _ in range(bags):
+        bag = list(range(len(SHAPE_ORDER)))
+        rng.shuffle(bag)
+        stream.extend(bag)
+    return stream
+
+
+class ShapeStream:
+    """Endless seeded 7-bag sequence, generated in bulk and handed out one shape id at a time"""
+    def __init__(self, seed=None, bags_per_chunk=64):
+        self.seed = seed
+        self.random = random.Random(seed)  # Own generator, so the global random state never matters
+        self.bags_per_chunk = bags_per_chunk
+        self.buffer = array('b')
+        self.position = 0
+
+    def refill(self):
+        # Keep only the unread tail, then add another chunk of bags
+        self.buffer = self.buffer[self.position:] + generate_bags(self.random, self.bags_per_chunk)
+        self.position = 0
+
+    def next_id(self):
+        if self.position >= len(self.buffer):
+            self.refill()
+        shape_id = self.buffer[self.position]
+        self.position += 1
+        return shape_id
+
+    def next_shape(self):
+        return SHAPE_ORDER[self.next_id()]
+
+    def take(self, count):
+        """The next `count` shape ids as bytes"""
+        while len(self.buffer) - self.position < count:
+            self.refill()
+        ids = self.buffer[self.position:self.position + count].tobytes()
+        self.position += count
+        return ids
+
+    def __iter__(self):
+        while True:
+            yield self.next_id()
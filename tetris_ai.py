@@ -2,15 +2,28 @@
 
 import copy
 import numpy as np
-from tetromino import Tetromino, SHAPES
+from engine import Board
+from bitboard import Bitboard
+from batch_evaluator import BatchEvaluator
+from beam_search import BeamSearchPlanner
+from network_evaluator import NetworkEvaluator
+from constants import AI_SEARCH_DEPTH, AI_BEAM_WIDTH, AI_EVALUATION_CACHE_SIZE, AI_SEARCH_CACHE_SIZE, AI_GENOME_FILE
+from placement_tables import PLACEMENT_TABLES, legal_x_range
+from transposition import ZOBRIST
+from lru import LRUCache
 
 #################################
 # GROUP A SKILL : COMPLEX MODEL #
 #################################
 
+def shape_name_of(piece):
+    """Pieces can be passed as Tetromino/Piece objects or plain shape names"""
+    return piece if isinstance(piece, str) else piece.shape_name
+
+
 class TetrisAI:
-    def __init__(self, game):
-        self.game = game
+    def __init__(self, game=None):
+        self.game = game  # Only kept for reference, the search is given its state explicitly
         # Weights strongly penalize height and holes
         self.weights = {
             'aggregate_height': -4.5,    
@@ -18,10 +31,30 @@ class TetrisAI:
             'surface_variance': -2.0,    
             'covered_holes': -7.5,       
         }
+        self.batch_evaluator = BatchEvaluator(self.weights)
         self.first_held_piece = True  # Flag to track if this is the first piece
         self.hold_threshold = -20  # Threshold for holding the first piece
+        self.planner = BeamSearchPlanner(self, depth=AI_SEARCH_DEPTH, beam_width=AI_BEAM_WIDTH)
+        # Heuristic scores keyed by board hash, and finished searches keyed by the whole search state
+        self.evaluation_cache = LRUCache(AI_EVALUATION_CACHE_SIZE)
+        self.search_cache = LRUCache(AI_SEARCH_CACHE_SIZE)
+        self.cached_weights = dict(self.weights)
+        # Evolved network that replaces the weights when set
+        self.evaluator = None
+        if AI_GENOME_FILE:
+            self.load_evaluator(AI_GENOME_FILE)
+
+    def load_evaluator(self, path):
+        """Score boards with a genome exported by the NEAT trainer"""
+        self.set_evaluator(NetworkEvaluator.load(path))
+
+    def set_evaluator(self, evaluator):
+        """Switch to another evaluator, None goes back to the weights"""
+        self.evaluator = evaluator
+        self.evaluation_cache.clear()
+        self.search_cache.clear()
 
-    def get_state_representation(self, grid, piece):
+    def get_state_representation(self, grid, piece, next_pieces=None, score=0):
         """Get the current state of the game"""
         state = {
             'board': self.get_board_state(grid),
@@ -31,8 +64,8 @@ class TetrisAI:
                 'y': piece.y,
                 'rotation': piece.rotation_state
             },
-            'next_piece': self.game.ai_next_pieces[0].shape_name if self.game.ai_next_pieces else None,
-            'score': self.game.ai_score.score
+            'next_piece': shape_name_of(next_pieces[0]) if next_pieces else None,
+            'score': score
         }
         return state
 
@@ -40,84 +73,100 @@ class TetrisAI:
         """Convert the game grid into a 2D binary array"""
         return [[1 if cell else 0 for cell in row] for row in grid.cells]
 
+    def get_reachable_rotations(self, piece_shape, board):
+        """Rotations the piece can reach by turning in place at its spawn position"""
+        rotations = PLACEMENT_TABLES[piece_shape]
+        spawn_x = board.width // 2 - len(rotations[0].matrix[0]) // 2
+        reachable = [0]
+        for rotation in range(1, 4):
+            if board.is_collision(rotations[rotation], spawn_x, -1):
+                break
+            reachable.append(rotation)
+        return reachable
+
+    def find_landing_row(self, piece, x_pos, board, tops=None):
+        """Drop a rotation from the top of the board, or return None if it doesn't fit"""
+        if board.is_collision(piece, x_pos, 0):
+            return None
+        if tops is not None:
+            return board.drop_onto_surface(piece, x_pos, tops)
+        return board.drop(piece, x_pos, 0)
+
     def simulate_placement(self, piece_shape, rotation, x_pos, grid):
         """Simulate placing a piece at a specific position and rotation"""
-        try:
-            # Create a copy of the current board
-            board_copy = [row[:] for row in grid.cells]
-            
-            # Create a test piece
-            test_piece = Tetromino(piece_shape, grid)
-            
-            # Apply rotation
-            for _ in range(rotation):
-                if not test_piece.rotate(use_wall_kicks=False):
-                    return None
-            
-            # Set x position
-            test_piece.x = x_pos
-            
-            # Find landing y position
-            test_piece.y = 0  # Start from top
-            while not grid.is_collision(test_piece):
-                test_piece.y += 1
-            test_piece.y -= 1  # Move back up one step
-            
-            # If piece is still above the board or in an invalid position, return None
-            if test_piece.y < 0 or grid.is_collision(test_piece):
-                return None
-                
-            # Place the piece on the board copy
-            for block_x, block_y in test_piece.get_block_positions():
-                if 0 <= block_y < len(board_copy) and 0 <= block_x < len(board_copy[0]):
-                    board_copy[block_y][block_x] = 1
-                else:
-                    return None  # Return None if any part of the piece is out of bounds
-                    
-            return board_copy
-            
-        except Exception as e:
-            print(f"Error in simulate_placement: {e}")
+        board = grid if isinstance(grid, Bitboard) else Bitboard.from_grid(grid)
+        if rotation not in self.get_reachable_rotations(piece_shape, board):
             return None
 
-    def generate_possible_moves(self, grid, piece):
+        piece = PLACEMENT_TABLES[piece_shape][rotation]
+        landing_y = self.find_landing_row(piece, x_pos, board)
+        if landing_y is None:
+            return None
+
+        # Place the piece on a copy of the board
+        board_copy = board.copy()
+        board_copy.lock(piece, x_pos, landing_y)
+        return board_copy
+
+    def generate_possible_moves(self, grid, piece, held_piece=None, can_hold=True):
         """Generate all possible moves for the current piece and held piece if available"""
         if not piece:
             return []
 
         possible_moves = []
-        pieces_to_try = [(piece.shape_name, False)]
+        pieces_to_try = [(shape_name_of(piece), False)]
         
         # Add held piece to possibilities if it exists and holding is allowed
-        if self.game.ai_held_piece and self.game.can_hold:
-            pieces_to_try.append((self.game.ai_held_piece.shape_name, True))
+        if held_piece and can_hold:
+            pieces_to_try.append((shape_name_of(held_piece), True))
 
-        board_width = grid.width
+        # The board is converted once, every candidate is then checked with bitwise ops
+        board = Bitboard.from_grid(grid)
+        tops = [board.height - h for h in grid.column_heights]
+        candidate_boards = []
 
         for piece_shape, requires_hold in pieces_to_try:
-            for rotation in range(4):
-                for x in range(-2, board_width + 2):
-                    resulting_board = self.simulate_placement(piece_shape, rotation, x, grid)
-                    
-                    if resulting_board is not None:
-                        move = {
-                            'rotation': rotation,
-                            'x': x,
-                            'y': None,
-                            'requires_hold': requires_hold,
-                            'shape': piece_shape,
-                            'type': 'normal'
-                        }
-                        
-                        score = self.evaluate_position(resulting_board)
-                        move['score'] = score
-                        
-                        possible_moves.append(move)
+            rotations = PLACEMENT_TABLES[piece_shape]
+            for rotation in self.get_reachable_rotations(piece_shape, board):
+                table = rotations[rotation]
+                # Only x positions that keep the whole piece on the board are tried
+                for x in legal_x_range(table, board.width):
+                    landing_y = self.find_landing_row(table, x, board, tops)
+                    if landing_y is None:
+                        continue
+
+                    resulting_board = board.copy()
+                    resulting_board.lock(table, x, landing_y)
+                    candidate_boards.append(resulting_board.rows)
+
+                    move = {
+                        'rotation': rotation,
+                        'x': x,
+                        'y': landing_y,
+                        'requires_hold': requires_hold,
+                        'shape': piece_shape,
+                        'type': 'normal'
+                    }
+                    possible_moves.append(move)
+
+        # Score the boards for both the current and held piece in one vectorized pass
+        if possible_moves:
+            for move, score in zip(possible_moves, self.evaluate_boards(candidate_boards, board.width)):
+                move['score'] = score
 
         return possible_moves
 
     def calculate_heuristics(self, board_state):
         """Calculate all heuristics for a given board state"""
+        if isinstance(board_state, Board):
+            # The grid keeps its column statistics up to date, no need to scan the cells
+            heights = board_state.column_heights
+            filled = [h - holes for h, holes in zip(heights, board_state.column_holes)]
+            return self.heuristics_from_profile(heights, filled)
+        if isinstance(board_state, Bitboard):
+            heights, filled = board_state.column_profile()
+            return self.heuristics_from_profile(heights, filled)
+
         height = len(board_state)
         width = len(board_state[0])
 
@@ -146,6 +195,18 @@ class TetrisAI:
             'covered_holes': covered_holes,
         }
 
+    def heuristics_from_profile(self, heights, filled):
+        """Calculate the heuristics from column heights and block counts alone"""
+        # Every empty cell under a column's top block is a hole
+        covered_holes = sum(self.hole_cost(h - f) for h, f in zip(heights, filled))
+
+        return {
+            'aggregate_height': sum(h * 1.2 for h in heights),
+            'maximum_height': max(heights) if heights else 0,
+            'surface_variance': self.calculate_surface_variance(heights),
+            'covered_holes': covered_holes,
+        }
+
     def calculate_surface_variance(self, heights):
         """Calculate how uneven the surface is"""
         if not heights:
@@ -177,15 +238,66 @@ class TetrisAI:
     def evaluate_position(self, board_state):
         """Evaluate a board position using weighted heuristics"""
         heuristics = self.calculate_heuristics(board_state)
-        score = sum(self.weights[key] * value for key, value in heuristics.items())
-        return score
+        if self.evaluator is not None:
+            return self.evaluator.score(heuristics)
+        return self.score_heuristics(heuristics)
+
+    def evaluate_boards(self, boards, width, hashes=None):
+        """Score a list of bitboard row lists, reusing cached scores for boards seen before"""
+        self.check_weights()
+        if hashes is None:
+            hashes = [ZOBRIST.hash_rows(rows) for rows in boards]
 
-    def get_best_move(self, grid, piece):
+        scores = [self.evaluation_cache.get(board_hash) for board_hash in hashes]
+        # Each distinct uncached board is evaluated once
+        uncached = {}
+        for rows, board_hash, score in zip(boards, hashes, scores):
+            if score is None and board_hash not in uncached:
+                uncached[board_hash] = rows
+
+        if uncached:
+            stacked = self.batch_evaluator.stack_boards(list(uncached.values()), width)
+            if self.evaluator is not None:
+                new_scores = self.evaluator.evaluate(self.batch_evaluator.calculate_heuristics(stacked))
+            else:
+                new_scores = self.batch_evaluator.evaluate(stacked)
+            for board_hash, score in zip(uncached, new_scores):
+                self.evaluation_cache.put(board_hash, float(score))
+                uncached[board_hash] = float(score)
+            scores = [uncached[board_hash] if score is None else score for board_hash, score in zip(hashes, scores)]
+        return scores
+
+    def check_weights(self):
+        """Cached scores are only valid for the weights they were computed with"""
+        if self.weights != self.cached_weights:
+            self.evaluation_cache.clear()
+            self.search_cache.clear()
+            self.cached_weights = dict(self.weights)
+
+    def cache_stats(self):
+        return {
+            'evaluation': self.evaluation_cache.stats(),
+            'search': self.search_cache.stats(),
+        }
+
+    def score_heuristics(self, heuristics):
+        return sum(self.weights[key] * value for key, value in heuristics.items())
+
+    def hole_cost(self, holes):
+        """Progressive penalty for a column's covered holes: the n-th one deep costs n"""
+        return holes * (holes + 1) // 2
+
+    def get_best_move(self, grid, piece, held_piece=None, next_pieces=None, can_hold=True):
         """Find the best move based on heuristics"""
         if not piece:
             return None
 
-        possible_moves = self.generate_possible_moves(grid, piece)
+        # Look further ahead through the preview queue when lookahead is enabled
+        if self.planner.depth > 1 and next_pieces:
+            best_move = self.plan_with_lookahead(grid, piece, held_piece, next_pieces, can_hold)
+            return self.apply_hold_threshold(best_move, piece, can_hold)
+
+        possible_moves = self.generate_possible_moves(grid, piece, held_piece, can_hold)
         
         if not possible_moves:
             return None
@@ -193,35 +305,59 @@ class TetrisAI:
         # Sort moves by score and return the best one
         best_move = max(possible_moves, key=lambda x: x['score'])
         
-        # Check if we should hold the first piece
-        if self.first_held_piece and best_move['score'] < self.hold_threshold and self.game.can_hold:
+        # The landing y was already found by the bitboard drop during move generation
+        return self.apply_hold_threshold(best_move, piece, can_hold)
+
+    def apply_hold_threshold(self, best_move, piece, can_hold):
+        """Hold the first piece instead if even its best move scores below hold_threshold.
+
+        Applies whether or not the best move already holds, which also uses up the first-piece check.
+        """
+        if not best_move:
+            return best_move
+        if self.first_held_piece and best_move['score'] < self.hold_threshold and can_hold:
             self.first_held_piece = False
-            best_move = {
+            return {
                 'rotation': 0,
                 'x': 0,
                 'y': 0,
                 'requires_hold': True,
-                'shape': piece.shape_name,
+                'shape': shape_name_of(piece),
                 'score': best_move['score'],
                 'type': 'normal'
             }
-            return best_move
-        
-        # Find the actual landing y position for the best move
-        test_piece = Tetromino(best_move['shape'], grid)
-        
-        # Apply rotation
-        for _ in range(best_move['rotation']):
-            test_piece.rotate(use_wall_kicks=False)
-            
-        # Set x position and find y
-        test_piece.x = best_move['x']
-        test_piece.y = 0
-        
-        while not grid.is_collision(test_piece):
-            test_piece.y += 1
-        test_piece.y -= 1
-        
-        best_move['y'] = test_piece.y
-        
         return best_move
+
+    def get_search_snapshot(self, grid, piece, held_piece=None, next_pieces=None, can_hold=True):
+        """Copy everything the search needs into plain data that the game can't change underneath it"""
+        return {
+            'rows': Bitboard.from_grid(grid).rows,
+            'width': grid.width,
+            'height': grid.height,
+            'current': shape_name_of(piece),
+            'preview': [shape_name_of(next_piece) for next_piece in (next_pieces or [])],
+            'hold': shape_name_of(held_piece) if held_piece else None,
+            'can_hold': can_hold,
+        }
+
+    def plan_with_lookahead(self, grid, piece, held_piece=None, next_pieces=None, can_hold=True):
+        """Find the best move with a beam search over the current, next and held pieces"""
+        return self.plan_from_snapshot(self.get_search_snapshot(grid, piece, held_piece, next_pieces, can_hold))
+
+    def plan_from_snapshot(self, snapshot, depth=None):
+        """Run the lookahead search on a snapshot, to the planner's depth unless told otherwise"""
+        depth = depth or self.planner.depth
+        board = Bitboard(snapshot['width'], snapshot['height'], snapshot['rows'])
+
+        # The same position is searched again until the piece is placed, so reuse the result
+        self.check_weights()
+        search_key = (ZOBRIST.hash_rows(board.rows), snapshot['current'], tuple(snapshot['preview']),
+                      snapshot['hold'], snapshot['can_hold'], depth, self.planner.beam_width)
+        best_move = self.search_cache.get(search_key)
+        if best_move is None:
+            best_move = self.planner.plan(board, snapshot['current'], snapshot['preview'],
+                                          snapshot['hold'], snapshot['can_hold'], depth)
+            if best_move is None:
+                return None
+            self.search_cache.put(search_key, best_move)
+        return dict(best_move)
@@ -1,22 +1,19 @@
 # tetromino.py
 
 import pygame
-from constants import COLORS, ANIMATION_SPEED, MAX_LOCK_MOVES, SHAPES, WALL_KICK_DATA
-import copy
+from constants import COLORS, ANIMATION_SPEED, MAX_LOCK_MOVES
+from engine import Piece
 
-class Tetromino:
-    def __init__(self, shape_name, grid):
-        self.shape_name = shape_name
-        self.shape = [row[:] for row in SHAPES[shape_name]]  # Make a deep copy of the initial shape
-        self.color = COLORS[shape_name]
-        self.grid = grid
-        self.reset_position()
+class Tetromino(Piece):
+    @property
+    def color(self):
+        return COLORS[self.shape_name]
 
     def reset_position(self):
         """Reset the piece to starting position"""
-        self.x = self.grid.width // 2 - len(self.shape[0]) // 2
-        self.y = -1
-        self.rotation_state = 0
+        super().reset_position()
+        self.ghost_key = None  # (grid, grid version, x, y, rotation) the ghost row was found for
+        self.ghost_y = None
         self.is_locked = False
         self.lock_delay_timer = 0
         self.lock_moves_count = 0
@@ -27,12 +24,7 @@ class Tetromino:
         self.target_y = self.visual_y
 
     def move(self, dx, dy):
-        old_x, old_y = self.x, self.y
-        self.x += dx
-        self.y += dy
-        
-        if self.grid.is_collision(self):
-            self.x, self.y = old_x, old_y
+        if not super().move(dx, dy):
             if dy > 0:  # If moving down caused collision
                 if not self.lock_delay_active:
                     self.lock_delay_active = True
@@ -43,9 +35,12 @@ class Tetromino:
         if dx != 0 and self.is_touching_ground():
             self.reset_lock_delay()
         
+        self.update_target()
+        return True
+
+    def update_target(self):
         self.target_x = self.x * self.grid.cell_size + self.grid.x_offset
         self.target_y = self.y * self.grid.cell_size + self.grid.y_offset
-        return True
 
     def update_position(self):
         self.visual_x += (self.target_x - self.visual_x) * ANIMATION_SPEED
@@ -53,83 +48,11 @@ class Tetromino:
 
     def rotate(self, clockwise=True, use_wall_kicks=True):
         """Rotate the piece with optional wall kick handling"""
-        # Store original state
-        original_shape = [row[:] for row in self.shape]
-        original_x = self.x
-        original_y = self.y
-        original_rotation_state = self.rotation_state
-
-        # Perform rotation using zip
-        if clockwise:
-            # Rotate clockwise: zip and reverse rows
-            self.shape = [list(row) for row in zip(*self.shape[::-1])]
-            self.rotation_state = (self.rotation_state + 1) % 4
-        else:
-            # Rotate counter-clockwise: reverse columns and zip
-            self.shape = [list(row) for row in zip(*self.shape)][::-1]
-            self.rotation_state = (self.rotation_state - 1) % 4
-
-        new_rotation_state = self.rotation_state
-
-        # First, try the basic rotation
-        if not self.grid.is_collision(self):
-            self.target_x = self.x * self.grid.cell_size + self.grid.x_offset
-            self.target_y = self.y * self.grid.cell_size + self.grid.y_offset
+        if super().rotate(clockwise, use_wall_kicks):
+            self.update_target()
             return True
-
-        # If basic rotation fails, try wall kicks if allowed
-        if use_wall_kicks and self.wall_kick(original_rotation_state, new_rotation_state):
-            self.target_x = self.x * self.grid.cell_size + self.grid.x_offset
-            self.target_y = self.y * self.grid.cell_size + self.grid.y_offset
-            return True
-
-        # If all attempts fail, revert to original state
-        self.shape = original_shape
-        self.x = original_x
-        self.y = original_y
-        self.rotation_state = original_rotation_state
         return False
 
-    def wall_kick(self, old_rotation_state, new_rotation_state):
-        """Handle wall kicks according to SRS"""
-        if self.shape_name == 'O':
-            return False  # O piece doesn't need wall kicks
-
-        # Get the appropriate kick data
-        kick_data = WALL_KICK_DATA['I'] if self.shape_name == 'I' else WALL_KICK_DATA['JLSTZ']
-
-        # Get the key for wall kick data
-        key = (old_rotation_state, new_rotation_state)
-
-        # Get the kick tests for this rotation
-        kick_tests = kick_data.get(key, [])
-
-        # Try each kick test
-        for dx, dy in kick_tests:
-            # Store original position
-            original_x = self.x
-            original_y = self.y
-
-            # Apply offset
-            self.x += dx
-            self.y += dy
-
-            # Check if this position works
-            if not self.grid.is_collision(self):
-                return True
-
-            self.x = original_x
-            self.y = original_y
-
-        return False
-
-    def is_touching_ground(self):
-        # Check if piece is touching ground or other pieces
-        self.y += 1
-        collision = self.grid.is_collision(self)
-        self.y -= 1
-        return collision
-
     def reset_lock_delay(self):
         if self.lock_delay_active and self.lock_moves_count < MAX_LOCK_MOVES:
             self.lock_delay_timer = 0
@@ -140,38 +63,25 @@ class Tetromino:
                 self.lock_moves_count = 0
 
     def hard_drop(self):
-        drop_distance = 0
-        while not self.grid.is_collision(self):
-            self.y += 1
-            drop_distance += 1
-        self.y -= 1
+        drop_distance = super().hard_drop()
         self.is_locked = True  # Immediately lock on hard drop
-        return drop_distance - 1
+        return drop_distance
 
     def get_ghost_position(self):
-        """Calculate the ghost piece position."""
-        ghost_tetromino = Tetromino(self.shape_name, self.grid)
-        ghost_tetromino.shape = copy.deepcopy(self.shape)
-        ghost_tetromino.color = self.color
-        ghost_tetromino.x = self.x
-        ghost_tetromino.y = self.y
-        ghost_tetromino.is_locked = self.is_locked
-
-        while not self.grid.is_collision(ghost_tetromino):
-            ghost_tetromino.y += 1
-        ghost_tetromino.y -= 1
-
-        return ghost_tetromino
-
-    def get_block_positions(self):
-        positions = []
-        for y, row in enumerate(self.shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    positions.append((self.x + x, self.y + y))
-        return positions
+        """(x, y) where the piece would land, only searched again after the piece or grid changes"""
+        ghost_key = (self.grid, self.grid.version, self.x, self.y, self.rotation_state)
+        if ghost_key != self.ghost_key:
+            start_y = self.y
+            while not self.grid.is_collision(self):
+                self.y += 1
+            self.ghost_y = self.y - 1
+            self.y = start_y
+            self.ghost_key = ghost_key
+        return self.x, self.ghost_y
 
     def draw(self, screen):
+        """Draw the piece at its animated position, returning the area it covers"""
+        drawn = None
         for x, y in self.get_block_positions():
             if y >= 0:
                 rect = pygame.Rect(
@@ -182,4 +92,5 @@ class Tetromino:
                 )
                 pygame.draw.rect(screen, self.color, rect)
                 pygame.draw.rect(screen, COLORS['white'], rect, 1)
-
+                drawn = rect if drawn is None else drawn.union(rect)
+        return drawn
@@ -0,0 +1,46 @@
+# text_cache.py
+
+import pygame
+from constants import FONT_NAME, TEXT_CACHE_SIZE
+from lru import LRUCache
+
+# Loading a font and rendering text are both slow enough to show up when done
+# every frame, and almost all the text on screen is the same from one frame to
+# the next. Fonts are shared by (name, size) and rendered text is kept by
+# (text, size, color) until it falls out of the cache.
+
+_fonts = {}
+
+
+def get_font(size, name=FONT_NAME):
+    """The shared font for (name, size), loaded on first use"""
+    font = _fonts.get((name, size))
+    if font is None:
+        font = pygame.font.Font(name, size)
+        _fonts[(name, size)] = font
+    return font
+
+
+class TextCache(LRUCache):
+    """Least recently used cache of rendered text surfaces"""
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        super().__init__(max_entries)
+
+    def render(self, text, size, color, name=FONT_NAME):
+        """Antialiased text surface, shared between callers so it must not be drawn on"""
+        key = (text, size, tuple(color), name)
+        surface = self.get(key)
+        if surface is None:
+            surface = get_font(size, name).render(text, True, color)
+            self.put(key, surface)
+        return surface
+
+    def stats(self):
+        return dict(super().stats(), fonts=len(_fonts))
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(text, size, color, name=FONT_NAME):
+    return TEXT_CACHE.render(text, size, color, name)
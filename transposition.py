@@ -0,0 +1,32 @@
+# transposition.py
+
+import random
+from constants import GRID_WIDTH, GRID_HEIGHT
+
+class ZobristHasher:
+    """Hashes board occupancy by XORing a random 64-bit key for every filled cell"""
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, seed=0):
+        self.width = width
+        self.height = height
+        rng = random.Random(seed)  # Fixed seed so hashes are the same every run
+        cell_keys = [[rng.getrandbits(64) for _ in range(width)] for _ in range(height)]
+
+        # XOR of the cell keys for every possible row mask, so a board hashes in one lookup per row
+        self.row_keys = []
+        for y in range(height):
+            keys = [0] * (1 << width)
+            for mask in range(1, 1 << width):
+                lowest_bit = mask & -mask
+                keys[mask] = keys[mask ^ lowest_bit] ^ cell_keys[y][lowest_bit.bit_length() - 1]
+            self.row_keys.append(keys)
+
+    def hash_rows(self, rows):
+        """Hash a bitboard's row masks"""
+        board_hash = 0
+        for row_keys, row in zip(self.row_keys, rows):
+            board_hash ^= row_keys[row]
+        return board_hash
+
+
+# Shared by everything that hashes standard sized boards
+ZOBRIST = ZobristHasher()